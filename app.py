@@ -1,8 +1,48 @@
-from datetime import datetime
-from phishing_detector import classify_sms
-from fraud_scoring import is_fraudulent_kmeans
-from ledger import log_transaction, fetch_unsynced_txns
+import argparse
+import asyncio
+import atexit
+import json
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from phishing_detector import classify_sms, classify_sms_batch
+from fraud_scoring import is_fraudulent, is_fraudulent_batch
+from ledger import log_transaction, log_transactions_bulk, fetch_unsynced_txns
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+SYNC_SERVER_URL = "http://127.0.0.1:5000"
+SYNC_URL = f"{SYNC_SERVER_URL}/sync"
+SYNC_BATCH_URL = f"{SYNC_SERVER_URL}/sync_batch"
+
+# Reuse one keep-alive connection pool for all sync calls
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
+# Blocked (phishing) txns are buffered and written in batches: one commit per flush
+BLOCK_FLUSH_SIZE = 64
+BLOCK_FLUSH_INTERVAL = 2.0  # seconds
+_BLOCK_BUFFER = deque()
+_last_block_flush = time.monotonic()
 
 # -----------------------------
 # 🧠 Fallback Check Functions (Mocked)
@@ -16,89 +56,264 @@ def check_bluetooth():
 def check_sms():
     return True  # Simulate SMS fallback
 
+# -----------------------------
+# 🧠 Phishing Result Cache
+# -----------------------------
+@lru_cache(maxsize=4096)
+def _classify_cached(sms_text):
+    # Stored as a tuple so callers can't mutate the cached result
+    return tuple(classify_sms(sms_text).items())
+
+def classify_sms_cached(sms_text):
+    return dict(_classify_cached(sms_text))
+
+# -----------------------------
+# 🚫 Blocked Txn Buffer
+# -----------------------------
+def _maybe_flush_blocked(force=False):
+    global _last_block_flush
+    if not _BLOCK_BUFFER:
+        return
+    due = time.monotonic() - _last_block_flush >= BLOCK_FLUSH_INTERVAL
+    if not (force or due or len(_BLOCK_BUFFER) >= BLOCK_FLUSH_SIZE):
+        return
+
+    batch = []
+    while _BLOCK_BUFFER:
+        txn = _BLOCK_BUFFER.popleft()
+        batch.append({
+            "recipient": txn["to_user"],
+            "amount": txn["amount"],
+            "channel": txn["channel"],
+            "status": txn["status"],
+            "is_phishing": txn["is_phishing"],
+        })
+    log_transactions_bulk(batch)
+    _last_block_flush = time.monotonic()
+
+atexit.register(_maybe_flush_blocked, force=True)
+
 # -----------------------------
 # 🔁 Sync with Flask Server
 # -----------------------------
-def sync_unsynced_txns():
-    txns = fetch_unsynced_txns()
-    print(f"\n🌐 Attempting to sync {len(txns)} unsynced txns...")
+def sync_unsynced_txns(batch_size=256):
+    """Stream unsynced txns from the ledger and sync them one batch at a time"""
+    print("\n🌐 Syncing unsynced txns...")
+    rows = fetch_unsynced_txns(batch_size)
+    total = 0
+    try:
+        while True:
+            ids = [row[0] for row in islice(rows, batch_size)]  # first column is id
+            if not ids:
+                break
+            total += len(ids)
+            if not _sync_batch(ids):
+                break
+    finally:
+        rows.close()
+    print(f"🌐 Attempted sync of {total} txns")
 
-    for row in txns:
-        txn_id = row[0]  # first column is id
-        data = {"id": txn_id}
-        try:
-            res = requests.post("http://127.0.0.1:5000/sync", json=data)
-            if res.status_code == 200:
-                print(f"✅ Synced txn #{txn_id}")
+def _sync_batch(ids):
+    """Sync one batch of ids; returns False if syncing should stop"""
+    try:
+        res = SESSION.post(SYNC_BATCH_URL, data=_dumps({"ids": ids}), headers=JSON_HEADERS, timeout=2)
+        if res.status_code == 404:
+            # Older sync server without the batch route
+            _sync_txns_one_by_one(ids)
+            return True
+        if res.status_code != 200:
+            print(f"❌ Batch sync failed: {_loads(res.content)}")
+            return False
+        for item in _loads(res.content)["results"]:
+            if item["status"] == "success":
+                print(f"✅ Synced txn #{item['id']}")
             else:
-                print(f"❌ Sync failed for txn #{txn_id}: {res.json()}")
+                print(f"❌ Sync failed for txn #{item['id']}: {item.get('msg')}")
+        return True
+    except Exception as e:
+        print(f"💥 Sync error: {e}")
+        return False
+
+def _print_sync_result(txn_id, res):
+    if isinstance(res, Exception):
+        print(f"💥 Sync error: {res}")
+    elif res.status_code == 200:
+        print(f"✅ Synced txn #{txn_id}")
+    else:
+        print(f"❌ Sync failed for txn #{txn_id}: {_loads(res.content)}")
+
+async def sync_txns_async(ids, max_connections=16):
+    """POST /sync for every id concurrently over one pooled httpx client"""
+    limits = httpx.Limits(max_connections=max_connections)
+    async with httpx.AsyncClient(limits=limits, timeout=2) as client:
+        results = await asyncio.gather(
+            *[client.post(SYNC_URL, content=_dumps({"id": txn_id}), headers=JSON_HEADERS) for txn_id in ids],
+            return_exceptions=True
+        )
+    for txn_id, res in zip(ids, results):
+        _print_sync_result(txn_id, res)
+
+def _sync_txns_one_by_one(ids):
+    if HTTPX_AVAILABLE:
+        asyncio.run(sync_txns_async(ids))
+        return
+
+    for txn_id in ids:
+        try:
+            res = SESSION.post(SYNC_URL, data=_dumps({"id": txn_id}), headers=JSON_HEADERS, timeout=2)
         except Exception as e:
-            print(f"💥 Sync error: {e}")
+            res = e
+        _print_sync_result(txn_id, res)
 
 # -----------------------------
 # 💳 Main Router Logic
 # -----------------------------
-def process_transaction():
-    print("🧾 --- Start Transaction ---")
-
-    # 1. Get txn input
+def read_transaction_input():
     amount = int(input("Enter amount to send: "))
     to_user = input("Enter recipient number: ")
     sms_text = input("Paste latest SMS message: ")
-    txn_time = datetime.now().strftime("%H:%M")
+    return {"amount": amount, "to_user": to_user, "sms_text": sms_text}
+
+# Batch driver: rows are classified, scored and routed this many at a time
+BATCH_CHUNK_SIZE = 256
 
-    txn = {
-        "amount": amount,
-        "to_user": to_user,
-        "time": txn_time,
+def _build_txn(txn_input):
+    # Integer epoch + minute of day; no string formatting/parsing on the hot path
+    now = time.time()
+    local = time.localtime(now)
+    return {
+        "amount": int(txn_input["amount"]),
+        "to_user": txn_input["to_user"],
+        "time_epoch": int(now),
+        "minute_of_day": local.tm_hour * 60 + local.tm_min,
     }
 
+def _pick_route():
+    """Probe the fallback chain once; returns (channel, status, message)"""
+    if check_network():
+        return "Online", "Success", "🌐 Sent via ONLINE"
+    if check_bluetooth():
+        return "Bluetooth", "Success", "📡 Sent via BLUETOOTH"
+    if check_sms():
+        return "SMS", "Success", "📲 Sent via SMS"
+    return "Ledger", "Queued", "💤 No method available. Logged locally."
+
+def _route_txn(txn, phish_result, fraud_result, route, ledger_rows=None):
+    """Block, score, route and log one built txn; returns True if it went out online
+
+    With ledger_rows the ledger row is appended there for the caller to bulk-log.
+    """
+    print("🧾 --- Start Transaction ---")
+
     # 2. Phishing Detection
-    phish_result = classify_sms(sms_text)
     txn["is_phishing"] = int(phish_result["is_phishing"])
-    txn["flags"] = phish_result["matched_keywords"] if txn["is_phishing"] else []
+    # classify_sms doesn't report matched keywords; keep the slot for detectors that do
+    txn["flags"] = list(phish_result.get("matched_keywords", [])) if txn["is_phishing"] else []
 
     if txn["is_phishing"]:
         print("🚨 Phishing detected. Blocking transaction.")
         txn["channel"] = "Blocked"
         txn["status"] = "Blocked"
-        log_transaction(txn)
-        return
+        _BLOCK_BUFFER.append(txn)
+        _maybe_flush_blocked()
+        return False
 
     # 3. Fraud Detection
-    fraud_result = is_fraudulent_kmeans(txn)
-    txn["is_fraud"] = int(fraud_result["is_fraud"])
+    if fraud_result is None:
+        fraud_result = is_fraudulent(txn)  # scores amount + minute_of_day
+    if "error" in fraud_result:
+        print(f"⚠️ Fraud scoring unavailable: {fraud_result['error']}")
+    txn["is_fraud"] = int(fraud_result.get("is_fraud", False))
     if txn["is_fraud"]:
-        txn["flags"].append("KMeans Risk")
+        txn["flags"].append("Autoencoder Risk")
 
     # 4. Fallback Routing
-    if check_network():
-        txn["channel"] = "Online"
-        txn["status"] = "Success"
-        print("🌐 Sent via ONLINE")
-    elif check_bluetooth():
-        txn["channel"] = "Bluetooth"
-        txn["status"] = "Success"
-        print("📡 Sent via BLUETOOTH")
-    elif check_sms():
-        txn["channel"] = "SMS"
-        txn["status"] = "Success"
-        print("📲 Sent via SMS")
-    else:
-        txn["channel"] = "Ledger"
-        txn["status"] = "Queued"
-        print("💤 No method available. Logged locally.")
+    if route is None:
+        route = _pick_route()
+    txn["channel"], txn["status"], message = route
+    print(message)
 
     # 5. Log Transaction
-    log_transaction(txn)
-    print("✅ Transaction processed & logged.")
+    row = {
+        "sender": None,
+        "recipient": txn["to_user"],
+        "amount": txn["amount"],
+        "channel": txn["channel"],
+        "is_fraud": txn["is_fraud"],
+        "is_phishing": txn["is_phishing"],
+        "status": txn["status"],
+    }
+    if ledger_rows is not None:
+        ledger_rows.append(row)
+        print("✅ Transaction processed.")
+    else:
+        # Only locally queued txns may wait for the ledger's buffered flush
+        log_transaction(**row, buffered=txn["status"] == "Queued")
+        print("✅ Transaction processed & logged.")
+    return txn["channel"] == "Online"
+
+def process_transaction(txn_input, phish_result=None, sync=True):
+    """txn_input = {"amount": 500, "to_user": "98...", "sms_text": "..."}
+
+    phish_result may be passed in when the SMS was already classified in a batch.
+    sync=False leaves the ledger sync to the caller.
+    """
+    txn = _build_txn(txn_input)
+    if phish_result is None:
+        phish_result = classify_sms_cached(txn_input.get("sms_text", ""))
+    online = _route_txn(txn, phish_result, None, None)
 
     # 6. Sync if online
-    if check_network():
+    if online and sync:
+        sync_unsynced_txns()
+
+def process_transactions(txn_inputs, chunk_size=BATCH_CHUNK_SIZE):
+    """Process a backlog of txns chunk by chunk.
+
+    Each chunk gets one vectorized SMS classification, one fraud scoring pass over
+    its non-phishing rows, one connectivity probe and one ledger commit; the ledger
+    is synced once at the end.
+    """
+    txn_inputs = iter(txn_inputs)
+    any_online = False
+    while True:
+        chunk = list(islice(txn_inputs, chunk_size))
+        if not chunk:
+            break
+        txns = [_build_txn(t) for t in chunk]
+        phish_results = classify_sms_batch([t.get("sms_text", "") for t in chunk])
+
+        clean = [i for i, r in enumerate(phish_results) if not r["is_phishing"]]
+        fraud_results = dict(zip(clean, is_fraudulent_batch([txns[i] for i in clean])))
+        route = _pick_route() if clean else None
+
+        ledger_rows = []
+        for i, (txn, phish_result) in enumerate(zip(txns, phish_results)):
+            any_online |= _route_txn(txn, phish_result, fraud_results.get(i), route, ledger_rows)
+        log_transactions_bulk(ledger_rows)
+
+    if any_online:
         sync_unsynced_txns()
 
 # -----------------------------
 # 🔥 MAIN
 # -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description="PayMesh transaction router")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="JSON-lines file of txns to process ('-' for stdin)")
+    args = parser.parse_args()
+
+    if not args.batch:
+        process_transaction(read_transaction_input())
+        return
+
+    stream = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    try:
+        process_transactions(json.loads(line) for line in stream if line.strip())
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
 if __name__ == "__main__":
-    process_transaction()
+    main()
@@ -1,60 +1,76 @@
 import sqlite3
+import threading
 import bcrypt
 import os
 
+# Same users table as the ledger, so the same bcrypt cost (PAYMESH_BCRYPT_ROUNDS),
+# login cache and session
+from ledger import BCRYPT_ROUNDS, check_password_cached, get_current_user as _get_session, set_current_user
+
 BASE_DIR = r"D:\The New Data Trio"
 DB_PATH = os.path.join(BASE_DIR, "ledger.db")
 
-# Store the logged-in user in-memory (you can move this to a better place later)
-current_user = {"username": None}
+# SQL used on the hot path; keeping the literals fixed lets sqlite3 reuse the prepared statements
+SQL_INSERT_USER = "INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?)"
+SQL_SELECT_PASSWORD_HASH = "SELECT password_hash FROM users WHERE username=?"
+
+# One connection per process, shared by all auth calls (Flask may call from several threads)
+_CONN = None
+_CONN_LOCK = threading.Lock()
+
+
+def _get_conn():
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None,
+                                cached_statements=256)
+        # WAL + synchronous=NORMAL: one fsync per commit instead of two. Commits stay
+        # durable across app crashes; only a power loss mid-commit can drop the last txn.
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute("PRAGMA cache_size=-8192")  # 8 MiB page cache
+        _CONN.execute("PRAGMA temp_store=MEMORY")
+    return _CONN
 
 
 def init_user_table():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE,
-            password_hash TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    with _CONN_LOCK:
+        _get_conn().execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE,
+                password_hash TEXT
+            )
+        ''')
+        # Implicit through UNIQUE, kept explicit for clarity
+        _get_conn().execute("CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)")
     print("✅ User table initialized.")
 
 
 def signup_user(username, password):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
 
-    # Check for duplicate
-    cursor.execute("SELECT * FROM users WHERE username=?", (username,))
-    if cursor.fetchone():
+    # UNIQUE(username) makes the insert a no-op for duplicates -> one statement
+    with _CONN_LOCK:
+        cursor = _get_conn().execute(SQL_INSERT_USER, (username, hashed_pw))
+    if cursor.rowcount == 0:
         print("❌ Username already exists. Choose another.")
         return False
 
-    hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-    cursor.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, hashed_pw))
-    conn.commit()
-    conn.close()
-
     # Set the current user
-    current_user["username"] = username
+    set_current_user({"username": username})
     print(f"✅ User '{username}' signed up and logged in.")
     return True
 
 
 def login_user(username, password):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT password_hash FROM users WHERE username=?", (username,))
-    row = cursor.fetchone()
-    conn.close()
+    with _CONN_LOCK:
+        cursor = _get_conn().cursor()
+        cursor.execute(SQL_SELECT_PASSWORD_HASH, (username,))
+        row = cursor.fetchone()
 
-    if row and bcrypt.checkpw(password.encode(), row[0]):
-        current_user["username"] = username
+    if row and check_password_cached(username, password, row[0]):
+        set_current_user({"username": username})
         print(f"✅ Logged in as {username}")
         return True
     else:
@@ -63,4 +79,6 @@ def login_user(username, password):
 
 
 def get_current_user():
-    return current_user.get("username")
+    """Username of the logged-in user, from the ledger session"""
+    session = _get_session()
+    return session["username"] if session else None
@@ -2,9 +2,10 @@
 
 import asyncio
 import time
-from datetime import datetime
+from datetime import datetime, date
 from pathlib import Path
 import json
+import re
 
 try:
     from bleak import BleakScanner, BleakClient
@@ -14,18 +15,34 @@ except ImportError:
     print("⚠️ Bluetooth BLE library not found. Install with: pip install bleak")
     BLUETOOTH_AVAILABLE = False
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# Payment keywords in device names, matched in one pass over the name
+_PAY_KW_RE = re.compile(r"pay|pos|terminal|merchant|card|nfc|wallet")
+
 class BluetoothDeviceScanner:
+    MAX_CONCURRENT_CONNECTS = 8  # parallel BleakClient connects, to avoid swamping the adapter
+
     def __init__(self):
         self.payment_service_uuids = [
             "0000180F-0000-1000-8000-00805F9B34FB",  # Battery Service (common in payment devices)
             "0000FFF0-0000-1000-8000-00805F9B34FB",  # Custom payment service UUID
         ]
+        self._payment_service_uuids_upper = frozenset(u.upper() for u in self.payment_service_uuids)
         self.scan_timeout = 10  # seconds
         self.log_dir = Path("bluetooth_logs")
         self.log_dir.mkdir(exist_ok=True)
+        self._log_date = None  # date the cached log path belongs to
+        self._log_path = None
     
-    async def scan_for_payment_devices(self):
-        """Scan for actual Bluetooth payment devices"""
+    async def scan_for_payment_devices(self, scan_timeout=None):
+        """Scan for actual Bluetooth payment devices (discovery lasts scan_timeout seconds)"""
+        scan_timeout = scan_timeout or self.scan_timeout
         if not BLUETOOTH_AVAILABLE:
             return {
                 "devices": [],
@@ -33,28 +50,33 @@ class BluetoothDeviceScanner:
                 "mock_devices": self._get_mock_devices()
             }
         
-        print(f"🔵 Scanning for Bluetooth devices... ({self.scan_timeout}s)")
+        print(f"🔵 Scanning for Bluetooth devices... ({scan_timeout}s)")
         
         try:
             # Scan for devices
-            devices = await BleakScanner.discover(timeout=self.scan_timeout)
+            devices = await BleakScanner.discover(timeout=scan_timeout)
             
-            payment_devices = []
-            for device in devices:
-                device_info = await self._analyze_device(device)
-                if device_info["is_payment_device"]:
-                    payment_devices.append(device_info)
+            # Analyze all devices concurrently; a failed analysis just drops that device
+            connect_limit = asyncio.Semaphore(self.MAX_CONCURRENT_CONNECTS)
+            results = await asyncio.gather(
+                *(self._analyze_device(device, connect_limit) for device in devices),
+                return_exceptions=True
+            )
+            payment_devices = [
+                r for r in results if isinstance(r, dict) and r["is_payment_device"]
+            ]
             
             print(f"✅ Found {len(payment_devices)} potential payment devices out of {len(devices)} total")
             
-            # Log scan results
-            self._log_scan_results(payment_devices)
+            # Log scan results (one timestamp shared by the log entry and the result)
+            timestamp = datetime.now().isoformat()
+            self._log_scan_results(payment_devices, timestamp)
             
             return {
                 "devices": payment_devices,
                 "total_devices_found": len(devices),
-                "scan_duration": self.scan_timeout,
-                "timestamp": datetime.now().isoformat()
+                "scan_duration": scan_timeout,
+                "timestamp": timestamp
             }
             
         except Exception as e:
@@ -65,7 +87,7 @@ class BluetoothDeviceScanner:
                 "mock_devices": self._get_mock_devices()
             }
     
-    async def _analyze_device(self, device):
+    async def _analyze_device(self, device, connect_limit=None):
         """Analyze if a device could be a payment terminal"""
         device_info = {
             "name": device.name or "Unknown Device",
@@ -77,10 +99,10 @@ class BluetoothDeviceScanner:
         }
         
         # Check device name for payment indicators
-        payment_keywords = ["pay", "pos", "terminal", "merchant", "card", "nfc", "wallet"]
         if device.name:
             name_lower = device.name.lower()
-            keyword_matches = sum(1 for keyword in payment_keywords if keyword in name_lower)
+            # Distinct keywords, as before: "POS-POS" still counts once
+            keyword_matches = len(set(_PAY_KW_RE.findall(name_lower)))
             device_info["confidence"] += keyword_matches * 0.3
             
             if keyword_matches > 0:
@@ -91,17 +113,24 @@ class BluetoothDeviceScanner:
         if device.rssi and device.rssi > -60:  # Strong signal
             device_info["confidence"] += 0.2
         
-        # Try to connect and check services (optional, can be slow)
+        # Connect and check services only when the name/signal check is not already
+        # confident - the connect can take up to 5 s per device
+        if device_info["is_payment_device"] and device_info["confidence"] >= 0.6:
+            return device_info
+        
         try:
-            async with BleakClient(device.address, timeout=5.0) as client:
-                services = await client.get_services()
-                
-                for service in services:
-                    if str(service.uuid).upper() in [uuid.upper() for uuid in self.payment_service_uuids]:
-                        device_info["is_payment_device"] = True
-                        device_info["confidence"] += 0.4
-                        device_info["device_type"] = "verified_payment_device"
-                        break
+            if connect_limit is None:
+                connect_limit = asyncio.Semaphore(1)
+            async with connect_limit:
+                async with BleakClient(device.address, timeout=5.0) as client:
+                    services = await client.get_services()
+                    
+                    for service in services:
+                        if str(service.uuid).upper() in self._payment_service_uuids_upper:
+                            device_info["is_payment_device"] = True
+                            device_info["confidence"] += 0.4
+                            device_info["device_type"] = "verified_payment_device"
+                            break
         except:
             # Connection failed, probably not a payment device or device is busy
             pass
@@ -121,38 +150,34 @@ class BluetoothDeviceScanner:
             }
         ]
     
-    def _log_scan_results(self, devices):
+    def _todays_log(self):
+        """Path of today's scan log, rebuilt only when the date changes"""
+        today = date.today()
+        if today != self._log_date:
+            self._log_path = self.log_dir / f"bluetooth_scan_{today.isoformat()}.jsonl"
+            self._log_date = today
+        return self._log_path
+    
+    def _log_scan_results(self, devices, timestamp=None):
         """Log Bluetooth scan results"""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "devices_found": len(devices),
             "devices": devices
         }
         
-        log_file = self.log_dir / f"bluetooth_scan_{datetime.now().strftime('%Y-%m-%d')}.json"
-        
-        logs = []
-        if log_file.exists():
-            try:
-                with open(log_file, 'r') as f:
-                    logs = json.load(f)
-            except:
-                logs = []
-        
-        logs.append(log_entry)
-        
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        # JSON Lines: one appended record per scan, history is never re-read or rewritten
+        with self._todays_log().open('ab') as f:
+            f.write(_dumps(log_entry) + b"\n")
     
-    def scan_for_devices(self):
-        """Synchronous wrapper for async scanning"""
+    def scan_for_devices(self, scan_timeout=None):
+        """Synchronous wrapper for async scanning (each call gets its own loop, closed afterwards)"""
         try:
-            loop = asyncio.get_event_loop()
+            asyncio.get_running_loop()
         except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        return loop.run_until_complete(self.scan_for_payment_devices())
+            return asyncio.run(self.scan_for_payment_devices(scan_timeout))
+        raise RuntimeError("scan_for_devices() called from a running event loop; "
+                           "await scan_for_payment_devices() directly")
 
 # Global Bluetooth scanner
 bluetooth_scanner = BluetoothDeviceScanner()
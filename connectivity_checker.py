@@ -2,9 +2,31 @@
 
 import socket
 import requests
+from requests.adapters import HTTPAdapter
 import subprocess
 import platform
-from datetime import datetime
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared HTTP session so repeated checks reuse pooled connections and TLS sessions
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# ping flags differ by OS; resolved once at import instead of per check
+_IS_WINDOWS = platform.system() == "Windows"
+_PING_FLAG_COUNT = "-n" if _IS_WINDOWS else "-c"
+_PING_FLAG_TIMEOUT = "-w" if _IS_WINDOWS else "-W"  # Windows: milliseconds, others: seconds
+
+@lru_cache(maxsize=4)
+def _iso_second(epoch_second):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(epoch_second))
+
+def _iso_now():
+    """Local ISO-8601 timestamp (millisecond precision) without building a datetime"""
+    now = time.time()
+    second = int(now)
+    return f"{_iso_second(second)}.{int((now - second) * 1000):03d}"
 
 class ConnectivityChecker:
     def __init__(self):
@@ -23,14 +45,12 @@ class ConnectivityChecker:
         """Check if internet is actually available"""
         print("🌐 Checking internet connectivity...")
         
-        # Method 1: DNS resolution test
-        dns_working = self._check_dns_resolution(timeout)
-        
-        # Method 2: HTTP request test
-        http_working = self._check_http_connectivity(timeout)
-        
-        # Method 3: Ping test
-        ping_working = self._check_ping_connectivity(timeout)
+        # Run DNS, HTTP and ping tests in parallel: total wait is the slowest, not the sum
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            f_dns = executor.submit(self._check_dns_resolution, timeout)
+            f_http = executor.submit(self._check_http_connectivity, timeout)
+            f_ping = executor.submit(self._check_ping_connectivity, timeout)
+            dns_working, http_working, ping_working = f_dns.result(), f_http.result(), f_ping.result()
         
         connectivity_score = sum([dns_working, http_working, ping_working])
         is_online = connectivity_score >= 2  # At least 2 out of 3 methods work
@@ -41,7 +61,7 @@ class ConnectivityChecker:
             "http_requests": http_working,
             "ping_test": ping_working,
             "connectivity_score": f"{connectivity_score}/3",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }
         
         print(f"📊 Internet status: {'🟢 Online' if is_online else '🔴 Offline'}")
@@ -50,36 +70,32 @@ class ConnectivityChecker:
         return result
     
     def _check_dns_resolution(self, timeout):
-        """Test DNS resolution"""
-        try:
-            socket.setdefaulttimeout(timeout)
-            for host in self.test_hosts:
-                socket.gethostbyname(host)
-            return True
-        except (socket.gaierror, socket.timeout):
-            return False
+        """Test reachability of a public DNS server (first host that accepts TCP/53 wins)"""
+        for host in self.test_hosts:
+            try:
+                socket.create_connection((host, 53), timeout=timeout).close()
+                return True
+            except OSError:
+                continue
+        return False
     
     def _check_http_connectivity(self, timeout):
-        """Test HTTP connectivity"""
-        try:
-            for url in self.test_urls[:2]:  # Test first 2 URLs
-                response = requests.get(url, timeout=timeout)
-                if response.status_code == 200:
+        """Test HTTP connectivity (HEAD only; any non-5xx answer proves the path is up)"""
+        for url in self.test_urls[:2]:  # Test first 2 URLs
+            try:
+                if _HTTP.head(url, timeout=timeout, allow_redirects=False).status_code < 500:
                     return True
-            return False
-        except (requests.RequestException, requests.Timeout):
-            return False
+            except requests.RequestException:
+                continue
+        return False
     
     def _check_ping_connectivity(self, timeout):
         """Test ping connectivity"""
         try:
-            system = platform.system().lower()
-            if system == "windows":
-                cmd = ["ping", "-n", "1", "-w", str(timeout * 1000), self.test_hosts[0]]
-            else:
-                cmd = ["ping", "-c", "1", "-W", str(timeout), self.test_hosts[0]]
-            
-            result = subprocess.run(cmd, capture_output=True, timeout=timeout + 1)
+            wait = int(timeout * 1000) if _IS_WINDOWS else max(1, int(timeout))
+            cmd = ["ping", _PING_FLAG_COUNT, "1", _PING_FLAG_TIMEOUT, str(wait), self.test_hosts[0]]
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                    timeout=timeout + 1)
             return result.returncode == 0
         except (subprocess.TimeoutExpired, subprocess.SubprocessError):
             return False
@@ -0,0 +1,64 @@
+# fraud_batch_test.py - Checks the NumPy scoring path against the torch autoencoder
+# Uses a randomly initialised model, so no trained weights or scaler files are needed
+
+import numpy as np
+import torch
+
+import fraud_scoring
+
+def use_random_model(seed=0):
+    torch.manual_seed(seed)
+    model = fraud_scoring.TxnAutoencoder().eval()
+    mean = np.array([5000.0, 12.0], dtype=np.float32)
+    std = np.array([3000.0, 6.0], dtype=np.float32)
+    fraud_scoring.load_model_and_scaler = lambda: (model, mean, std)
+    fraud_scoring._scoring_state.cache_clear()
+    return model, mean, std
+
+def torch_scores(model, mean, std, rows):
+    x = torch.tensor((np.asarray(rows, dtype=np.float32) - mean) / std)
+    with torch.no_grad():
+        return ((model(x) - x) ** 2).mean(dim=1).numpy()
+
+def test_numpy_matches_torch():
+    model, mean, std = use_random_model()
+    txns = [
+        {"amount": 500, "time": "09:15"},
+        {"amount": 17000, "time": "00:30"},
+        {"amount": 2500, "minute_of_day": 13 * 60 + 45},
+        {"amount": 0, "time": "23:59"},
+    ]
+    rows = [(500, 9.25), (17000, 0.5), (2500, 13.75), (0, 23 + 59 / 60)]
+
+    expected = torch_scores(model, mean, std, rows)
+    results = fraud_scoring.is_fraudulent_batch(txns)
+    got = np.array([r["fraud_score"] for r in results])
+    assert np.allclose(got, expected.round(5), atol=1e-5), (got, expected)
+    for result, score in zip(results, expected):
+        assert result["is_fraud"] == (score > fraud_scoring.FRAUD_THRESHOLD)
+    print("✅ NumPy forward pass matches torch")
+
+def test_single_matches_batch():
+    use_random_model(seed=1)
+    txns = [{"amount": a, "time": f"{h:02d}:30"} for a, h in ((100, 1), (9000, 14), (40000, 3))]
+    batch = fraud_scoring.is_fraudulent_batch(txns)
+    assert [fraud_scoring.is_fraudulent(t) for t in txns] == batch
+    assert fraud_scoring.is_fraudulent_batch([]) == []
+    print("✅ is_fraudulent agrees with is_fraudulent_batch")
+
+def test_bad_row_only_fails_itself():
+    model, mean, std = use_random_model()
+    txns = [{"amount": 100}, {"amount": 200, "time": "10:00"}, {"amount": "abc", "time": "10:00"}]
+    results = fraud_scoring.is_fraudulent_batch(txns)
+    assert len(results) == 3
+    assert "error" in results[0] and "error" in results[2]
+    expected = torch_scores(model, mean, std, [(200, 10.0)])
+    assert abs(results[1]["fraud_score"] - round(float(expected[0]), 5)) < 1e-5, results
+    assert fraud_scoring.is_fraudulent_batch([{"time": "10:00"}])[0].keys() == {"error"}
+    print("✅ Malformed rows get error dicts; valid rows are still scored")
+
+if __name__ == "__main__":
+    test_numpy_matches_torch()
+    test_single_matches_batch()
+    test_bad_row_only_fails_itself()
+    print("🎉 All fraud scoring checks passed")
@@ -1,15 +1,18 @@
 import random
 import csv
+import numpy as np
+
+_RNG = np.random.default_rng()
 
 def generate_txn(hour_range, amount_range, n):
-    data = []
-    for _ in range(n):
-        hour = random.randint(hour_range[0], hour_range[1])
-        minute = random.randint(0, 59)
-        time_str = f"{hour:02d}:{minute:02d}"
-        amount = random.randint(amount_range[0], amount_range[1])
-        data.append({"amount": amount, "time": time_str})
-    return data
+    # Draw all hours/minutes/amounts in one call each instead of per row
+    hours = _RNG.integers(hour_range[0], hour_range[1] + 1, n).tolist()
+    minutes = _RNG.integers(0, 60, n).tolist()
+    amounts = _RNG.integers(amount_range[0], amount_range[1] + 1, n).tolist()
+    return [
+        {"amount": amount, "time": f"{hour:02d}:{minute:02d}"}
+        for amount, hour, minute in zip(amounts, hours, minutes)
+    ]
 
 
 def create_dataset():
@@ -24,8 +27,7 @@ def create_dataset():
     with open(r"D:\The New Data Trio\fraud_dataset.csv", "w", newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=["amount", "time"])
         writer.writeheader()
-        for row in dataset:
-            writer.writerow(row)
+        writer.writerows(dataset)
 
     print("✅ Dataset created at D:\\The New Data Trio\\fraud_dataset.csv")
 
@@ -2,6 +2,7 @@ import torch
 import torch.nn as nn
 import numpy as np
 import os
+from functools import lru_cache
 
 # 🔧 File paths
 BASE_DIR = r"D:\The New Data Trio"
@@ -26,7 +27,8 @@ class TxnAutoencoder(nn.Module):
     def forward(self, x):
         return self.decoder(self.encoder(x))
 
-# ✅ Load model + scaler
+# ✅ Load model + scaler (once per process; a failed load is retried on the next call)
+@lru_cache(maxsize=1)
 def load_model_and_scaler():
     model = TxnAutoencoder()
     model.load_state_dict(torch.load(MODEL_PATH))
@@ -37,12 +39,72 @@ def load_model_and_scaler():
 
     return model, scaler_mean, scaler_std
 
+@lru_cache(maxsize=1)
+def _scoring_state():
+    """Scaler and autoencoder weights as plain float32 arrays (Linear layers at encoder/decoder[0] and [2])"""
+    model, scaler_mean, scaler_std = load_model_and_scaler()
+    layers = (model.encoder[0], model.encoder[2], model.decoder[0], model.decoder[2])
+    weights = tuple(
+        (layer.weight.detach().numpy().T.copy(), layer.bias.detach().numpy().copy())
+        for layer in layers
+    )
+    mean = np.asarray(scaler_mean, dtype=np.float32)
+    std = np.asarray(scaler_std, dtype=np.float32)
+    return weights, mean, std
+
+def _reconstruct(x, weights):
+    """Autoencoder forward pass in NumPy: Linear -> ReLU -> Linear, twice"""
+    (w1, b1), (w2, b2), (w3, b3), (w4, b4) = weights
+    z = np.maximum(x @ w1 + b1, 0) @ w2 + b2
+    return np.maximum(z @ w3 + b3, 0) @ w4 + b4
+
+def _txn_hour(txn):
+    """Fractional hour of day, from a precomputed minute_of_day or an "HH:MM" time string"""
+    if "minute_of_day" in txn:
+        return txn["minute_of_day"] / 60
+    return int(txn["time"].split(":")[0]) + int(txn["time"].split(":")[1]) / 60
+
+FRAUD_THRESHOLD = 0.15  # ⚠️ Tune this threshold as needed
+
+# ✅ Batch scoring: one forward pass for all transactions
+def is_fraudulent_batch(txns):
+    """
+    txns = [{"amount": 16000, "time": "01:30"}, ...]
+    Returns one {"fraud_score", "is_fraud"} dict per transaction, in order.
+    A malformed txn gets an {"error"} dict; the rest of the batch is still scored.
+    """
+    results = [None] * len(txns)
+    rows, valid = [], []
+    for i, t in enumerate(txns):
+        try:
+            rows.append((float(t["amount"]), float(_txn_hour(t))))
+            valid.append(i)
+        except Exception as e:
+            results[i] = {"error": f"invalid transaction: {e}"}
+    if not rows:
+        return results
+
+    try:
+        weights, mean, std = _scoring_state()
+        x = (np.asarray(rows, dtype=np.float32) - mean) / std
+        recon = _reconstruct(x, weights)
+        scores = ((recon - x) ** 2).mean(axis=1).tolist()
+    except Exception as e:
+        # Model/scaler failure: nothing in the batch can be scored
+        for i in valid:
+            results[i] = {"error": str(e)}
+        return results
+
+    for i, score in zip(valid, scores):
+        results[i] = {"fraud_score": round(score, 5), "is_fraud": score > FRAUD_THRESHOLD}
+    return results
+
 # ✅ Main scoring function
 def is_fraudulent(txn):
     """
     txn = {
         "amount": 16000,
-        "time": "01:30"
+        "time": "01:30"          # or "minute_of_day": 90
     }
     Returns:
         {
@@ -50,22 +112,7 @@ def is_fraudulent(txn):
             "is_fraud": bool
         }
     """
-    try:
-        model, mean, std = load_model_and_scaler()
-        hour = int(txn["time"].split(":")[0]) + int(txn["time"].split(":")[1]) / 60
-        input_arr = np.array([txn["amount"], hour], dtype=np.float32)
-        norm_input = (input_arr - mean) / std
-        x = torch.tensor(norm_input, dtype=torch.float32).unsqueeze(0)
-        recon = model(x)
-        loss = torch.nn.functional.mse_loss(recon, x)
-        score = float(loss.item())
-
-        return {
-            "fraud_score": round(score, 5),
-            "is_fraud": score > 0.15  # ⚠️ Tune this threshold as needed
-        }
-    except Exception as e:
-        return {"error": str(e)}
+    return is_fraudulent_batch([txn])[0]
 
 # ✅ Quick test
 if __name__ == "__main__":
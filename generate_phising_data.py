@@ -1,4 +1,4 @@
-import pandas as pd
+import csv
 import os
 
 # Your custom directory
@@ -34,7 +34,9 @@ data = [
 ]
 
 # Save as CSV
-df = pd.DataFrame(data, columns=["text", "label"])
-df.to_csv(output_path, index=False)
+with open(output_path, "w", newline="", encoding="utf-8") as f:
+    writer = csv.writer(f)
+    writer.writerow(["text", "label"])
+    writer.writerows(data)
 
 print(f"✅ Dataset saved at: {output_path}")
@@ -4,7 +4,12 @@ import sqlite3
 import os
 import bcrypt
 import time
-from datetime import datetime
+import hashlib
+import hmac
+import threading
+import atexit
+from collections import deque, OrderedDict
+from contextvars import ContextVar
 
 # 📁 Auto-create base directory if it doesn't exist
 BASE_DIR = r"D:\The New Data Trio"
@@ -14,100 +19,251 @@ if not os.path.exists(BASE_DIR):
 
 DB_PATH = os.path.join(BASE_DIR, "ledger.db")
 
-# Global session management
-current_user_session = {}
+# bcrypt cost factor for new hashes (each extra round doubles hashing time); override per
+# deployment. Existing hashes with a different cost are re-hashed on the next login.
+BCRYPT_ROUNDS = int(os.environ.get("PAYMESH_BCRYPT_ROUNDS", "12"))
+
+# Session of the user logged in via verify_user (user_data dict, or None). This is the only
+# current-user state; auth_server reads and writes it through the session helpers below.
+# A ContextVar, so two UI worker threads logging in don't see each other's session.
+_current_user = ContextVar("ledger_current_user", default=None)
+
+# Hot-path SQL as fixed module constants: stable texts keep hitting the connection's
+# prepared-statement cache (sized by cached_statements below) instead of being re-parsed
+SQL_INSERT_USER = "INSERT INTO users (username, password_hash, phone_number, created_at) VALUES (?, ?, ?, ?)"
+SQL_SELECT_USER_FOR_LOGIN = (
+    "SELECT u.id, u.username, u.password_hash, u.phone_number, u.last_login, a.attempts, a.last_attempt"
+    " FROM (SELECT ? AS username) q"
+    " LEFT JOIN users u ON u.username = q.username"
+    " LEFT JOIN login_attempts a ON a.username = q.username"
+)
+SQL_UPDATE_LAST_LOGIN = "UPDATE users SET last_login=? WHERE username=?"
+SQL_UPDATE_PASSWORD_HASH = "UPDATE users SET password_hash=? WHERE username=?"
+SQL_UPDATE_PHONE = "UPDATE users SET phone_number=? WHERE id=?"
+SQL_SELECT_UNNORMALIZED_PHONES = (
+    "SELECT id, phone_number FROM users WHERE typeof(phone_number) NOT IN ('text', 'null')"
+    " OR phone_number LIKE '%e+%' OR phone_number LIKE '%.0' OR phone_number GLOB '*[ ()-]*'"
+)
+SQL_SELECT_ALL_USERS = "SELECT id, username, phone_number, created_at, last_login FROM users"
+# Keyset pagination on the rowid: a range scan that stops after LIMIT rows
+SQL_SELECT_USERS_PAGE = (
+    "SELECT id, username, phone_number, created_at, last_login FROM users"
+    " WHERE id > ? ORDER BY id LIMIT ?"
+)
+SQL_SELECT_ATTEMPTS = "SELECT attempts, last_attempt FROM login_attempts WHERE username=?"
+SQL_DELETE_ATTEMPTS = "DELETE FROM login_attempts WHERE username=?"
+# First failure inserts 1, later ones bump the counter
+SQL_UPSERT_ATTEMPT = (
+    "INSERT INTO login_attempts (username, attempts, last_attempt) VALUES (?, 1, ?) "
+    "ON CONFLICT(username) DO UPDATE SET attempts = attempts + 1, last_attempt = excluded.last_attempt"
+)
+SQL_INSERT_TRANSACTION = (
+    "INSERT INTO transactions (sender, recipient, amount, time, channel, "
+    "is_fraud, is_phishing, status, txn_id, synced) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)"
+)
+SQL_SELECT_UNSYNCED = (
+    "SELECT id, sender, recipient, amount, time, channel, status, txn_id "
+    "FROM transactions WHERE synced=0"
+)
+# Two index lookups instead of an OR scan; the second excludes self-transfers already counted
+SQL_COUNT_USER_TRANSACTIONS = (
+    "SELECT (SELECT COUNT(*) FROM transactions WHERE sender=?)"
+    " + (SELECT COUNT(*) FROM transactions WHERE recipient=? AND sender IS NOT ?)"
+)
+SQL_CREATE_TXN_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_tx_sender ON transactions(sender)",
+    "CREATE INDEX IF NOT EXISTS idx_tx_recipient ON transactions(recipient)",
+)
+
+# One connection per process, shared by every helper below (callers may be on several
+# threads, so access goes through _CONN_LOCK; re-entrant because helpers call each other)
+_CONN = None
+_CONN_LOCK = threading.RLock()
+
+def get_conn():
+    """Shared ledger connection, opened on first use"""
+    global _CONN
+    if _CONN is None:
+        with _CONN_LOCK:
+            if _CONN is None:
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+                # WAL + synchronous=NORMAL: fsync at checkpoints instead of on every commit.
+                # A power loss can drop the last few commits, but never corrupts the db.
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+                _CONN = conn
+    return _CONN
+
+# ====== TIMESTAMPS ======
+
+_ISO_CACHE = [-1, ""]
+
+def _now_iso():
+    """Local ISO-8601 timestamp to the second, formatted at most once per second"""
+    now = int(time.time())
+    cached = _ISO_CACHE
+    if now != cached[0]:
+        cached[:] = [now, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now))]
+    return cached[1]
 
 # ====== DATABASE INITIALIZATION ======
 
+# Set once the schema has been checked; helpers only fall back to the check if it failed at import
+_initialized = False
+
+def _ensure_db():
+    if not _initialized:
+        ensure_database_exists()
+
 def ensure_database_exists():
-    """Ensure database and all tables exist - called before any operation"""
+    """Ensure database and all tables exist (runs on import, and again only if that failed)"""
+    global _initialized
     if not os.path.exists(DB_PATH):
         print("📝 Database not found. Creating new database...")
         initialize_all_tables()
     else:
         # Ensure all tables exist even if DB file exists
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            # Check if users table has all required columns
-            cursor.execute("PRAGMA table_info(users)")
-            columns = [col[1] for col in cursor.fetchall()]
-            
-            if 'phone_number' not in columns:
-                print("📝 Updating database schema...")
-                cursor.execute("ALTER TABLE users ADD COLUMN phone_number TEXT")
-                cursor.execute("ALTER TABLE users ADD COLUMN created_at TEXT")
-                cursor.execute("ALTER TABLE users ADD COLUMN last_login TEXT")
+            with _CONN_LOCK:
+                conn = get_conn()
+                cursor = conn.cursor()
+                # Check if users table has all required columns
+                cursor.execute("PRAGMA table_info(users)")
+                columns = [col[1] for col in cursor.fetchall()]
+                
+                if 'phone_number' not in columns:
+                    print("📝 Updating database schema...")
+                    cursor.execute("ALTER TABLE users ADD COLUMN phone_number TEXT")
+                    cursor.execute("ALTER TABLE users ADD COLUMN created_at TEXT")
+                    cursor.execute("ALTER TABLE users ADD COLUMN last_login TEXT")
+                    conn.commit()
+                    print("✅ Database schema updated")
+                
+                # Indexes added after the first release; cheap no-ops once they exist
+                for sql in SQL_CREATE_TXN_INDEXES:
+                    cursor.execute(sql)
                 conn.commit()
-                print("✅ Database schema updated")
-            
-            conn.close()
+                _migrate_phone_numbers(conn)
         except Exception as e:
             print(f"⚠️ Database check error: {e}")
             initialize_all_tables()
+    _initialized = True
 
 def initialize_all_tables():
     """Initialize all database tables"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with _CONN_LOCK:
+        conn = get_conn()
+        cursor = conn.cursor()
+
+        # WAL (set in get_conn) is persistent in the db file, so every other
+        # connection to it - sync server, trust score - picks it up too
     
-    # Users table with proper phone number as TEXT
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            phone_number TEXT,
-            created_at TEXT,
-            last_login TEXT
-        )
-    ''')
+        # Users table with proper phone number as TEXT
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password_hash TEXT NOT NULL,
+                phone_number TEXT,
+                created_at TEXT,
+                last_login TEXT
+            )
+        ''')
     
-    # Login attempts table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS login_attempts (
-            username TEXT PRIMARY KEY,
-            attempts INTEGER DEFAULT 0,
-            last_attempt REAL
-        )
-    ''')
+        # Login attempts table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS login_attempts (
+                username TEXT PRIMARY KEY,
+                attempts INTEGER DEFAULT 0,
+                last_attempt REAL
+            )
+        ''')
     
-    # Transactions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            sender TEXT,
-            recipient TEXT,
-            amount REAL,
-            time TEXT,
-            channel TEXT,
-            is_fraud INTEGER,
-            is_phishing INTEGER,
-            status TEXT,
-            flags TEXT,
-            synced INTEGER DEFAULT 0,
-            txn_id TEXT
-        )
-    ''')
+        # Transactions table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sender TEXT,
+                recipient TEXT,
+                amount REAL,
+                time TEXT,
+                channel TEXT,
+                is_fraud INTEGER,
+                is_phishing INTEGER,
+                status TEXT,
+                flags TEXT,
+                synced INTEGER DEFAULT 0,
+                txn_id TEXT
+            )
+        ''')
+        
+        # Per-user lookups (get_transaction_count) hit these instead of scanning
+        for sql in SQL_CREATE_TXN_INDEXES:
+            cursor.execute(sql)
     
-    conn.commit()
-    conn.close()
+        conn.commit()
     print("✅ All database tables initialized successfully!")
 
 # ====== PASSWORD FUNCTIONS ======
 
 def hash_password(password):
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+def _hash_rounds(hashed):
+    """Cost factor embedded in a bcrypt hash ("$2b$12$..." -> 12), or None if unparseable"""
+    if isinstance(hashed, bytes):  # auth_server stores the raw bcrypt bytes
+        hashed = hashed.decode()
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
 
 def verify_password(password, hashed):
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+    if isinstance(hashed, str):
+        hashed = hashed.encode()
+    return bcrypt.checkpw(password.encode(), hashed)
+
+# Login cache shared by every login path on the users table (verify_user here and
+# auth_server.login_user): (username, stored hash, HMAC of password) -> expiry.
+# The stored hash in the key retires entries when a password changes, and only a
+# keyed digest of the password is held, never the password itself.
+# verify_user still updates lockout counters on every login, cache hit or not.
+LOGIN_CACHE_TTL = 60
+LOGIN_CACHE_SIZE = 1024
+_login_cache = OrderedDict()
+_login_cache_lock = threading.Lock()
+_LOGIN_CACHE_SECRET = os.urandom(32)
+
+def check_password_cached(username, password, hashed):
+    """verify_password, skipping bcrypt for a login verified in the last LOGIN_CACHE_TTL seconds"""
+    digest = hmac.new(_LOGIN_CACHE_SECRET, password.encode(), hashlib.sha256).digest()
+    key = (username, hashed, digest)
+    now = time.monotonic()
+
+    with _login_cache_lock:
+        expires_at = _login_cache.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                _login_cache.move_to_end(key)
+                return True
+            del _login_cache[key]
+
+    if not verify_password(password, hashed):
+        return False
+
+    with _login_cache_lock:
+        _login_cache[key] = now + LOGIN_CACHE_TTL
+        if len(_login_cache) > LOGIN_CACHE_SIZE:
+            _login_cache.popitem(last=False)
+    return True
 
 # ====== USER MANAGEMENT ======
 
 def create_user(username, password, phone_number=""):
     """Create user with automatic database creation"""
-    # Ensure database exists first
-    ensure_database_exists()
+    _ensure_db()
     
     # Input validation
     if not username or not password:
@@ -119,23 +275,20 @@ def create_user(username, password, phone_number=""):
     if len(password) < 6:
         return {"success": False, "message": "Password must be at least 6 characters"}
     
-    # Ensure phone number is stored as string (not scientific notation)
-    if phone_number and phone_number.isdigit():
-        phone_number = str(phone_number)  # Keep as string
+    # Store the canonical form once so reads need no cleanup
+    phone_number = normalize_phone_number(phone_number)
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
     try:
         hashed_pw = hash_password(password)
-        created_at = datetime.now().isoformat()
+        created_at = _now_iso()
         
-        cursor.execute('''
-            INSERT INTO users (username, password_hash, phone_number, created_at) 
-            VALUES (?, ?, ?, ?)
-        ''', (username, hashed_pw, phone_number, created_at))
-        
-        conn.commit()
-        user_id = cursor.lastrowid
+        with _CONN_LOCK:
+            conn = get_conn()
+            cursor = conn.cursor()
+            cursor.execute(SQL_INSERT_USER, (username, hashed_pw, phone_number, created_at))
+            
+            conn.commit()
+            user_id = cursor.lastrowid
         print(f"✅ User '{username}' created successfully with ID {user_id}")
         
         return {
@@ -150,51 +303,50 @@ def create_user(username, password, phone_number=""):
     except Exception as e:
         print(f"❌ Error creating user: {e}")
         return {"success": False, "message": f"Registration failed: {str(e)}"}
-    finally:
-        conn.close()
 
 def verify_user(username, password):
     """Verify user login with automatic database creation"""
-    # Ensure database exists first
-    ensure_database_exists()
+    _ensure_db()
     
     if not username or not password:
         return {"success": False, "message": "Username and password are required"}
     
-    # Check brute force protection
-    if is_locked_out(username):
-        remaining_time = get_lockout_remaining_time(username)
-        return {
-            "success": False, 
-            "message": "Account temporarily locked",
-            "locked": True,
-            "wait_time": remaining_time
-        }
+    # User row and brute-force counters in one query (a row comes back even for unknown users)
+    with _CONN_LOCK:
+        cursor = get_conn().cursor()
+        cursor.execute(SQL_SELECT_USER_FOR_LOGIN, (username,))
+        user_id, db_username, hashed, phone_number, last_login, attempts, last_attempt = cursor.fetchone()
+    attempts = attempts or 0
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT id, username, password_hash, phone_number, last_login 
-        FROM users WHERE username=?
-    ''', (username,))
-    row = cursor.fetchone()
+    # Check brute force protection
+    if attempts >= MAX_ATTEMPTS:
+        elapsed = time.time() - last_attempt
+        if elapsed <= LOCKOUT_SECONDS:
+            return {
+                "success": False, 
+                "message": "Account temporarily locked",
+                "locked": True,
+                "wait_time": int(max(0, LOCKOUT_SECONDS - elapsed))
+            }
+        reset_attempts(username)
+        attempts = 0
 
-    if not row:
+    if user_id is None:
         record_login_attempt(username, False)
-        conn.close()
         return {"success": False, "message": "User not found"}
-
-    user_id, db_username, hashed, phone_number, last_login = row
     
-    if verify_password(password, hashed):
-        # Successful login
-        record_login_attempt(username, True)
-        
-        # Update last login time
-        now = datetime.now().isoformat()
-        cursor.execute("UPDATE users SET last_login=? WHERE username=?", (now, username))
-        conn.commit()
-        conn.close()
+    if check_password_cached(username, password, hashed):
+        # Successful login: clear failed attempts and update last login in one commit
+        now = _now_iso()
+        # Migrate hashes made with another cost factor while the password is at hand
+        new_hash = hash_password(password) if _hash_rounds(hashed) != BCRYPT_ROUNDS else None
+        with _CONN_LOCK:
+            conn = get_conn()
+            with conn:
+                conn.execute(SQL_DELETE_ATTEMPTS, (username,))
+                conn.execute(SQL_UPDATE_LAST_LOGIN, (now, username))
+                if new_hash:
+                    conn.execute(SQL_UPDATE_PASSWORD_HASH, (new_hash, username))
         
         # Set current user session with properly formatted phone
         user_data = {
@@ -215,9 +367,8 @@ def verify_user(username, password):
     else:
         # Failed login
         record_login_attempt(username, False)
-        conn.close()
         
-        remaining = get_remaining_attempts(username)
+        remaining = max(0, MAX_ATTEMPTS - (attempts + 1))
         if remaining <= 0:
             return {
                 "success": False, 
@@ -231,34 +382,52 @@ def verify_user(username, password):
                 "message": f"Invalid password. {remaining} attempts remaining."
             }
 
-def format_phone_number(phone_str):
-    """Fix phone number from scientific notation to normal format"""
-    if not phone_str:
+# Separators dropped from stored phone numbers ("+" is kept: Twilio needs E.164)
+_PHONE_STRIP = str.maketrans("", "", " -()")
+
+def normalize_phone_number(phone):
+    """Canonical stored form: text, no separators, scientific notation expanded"""
+    if not phone:
         return ""
-    
-    try:
-        # If it's in scientific notation, convert it back
-        if 'e+' in str(phone_str):
-            return str(int(float(phone_str)))
-        return str(phone_str)
-    except (ValueError, TypeError):
-        return str(phone_str) if phone_str else ""
+    if isinstance(phone, float):
+        return str(int(phone))
+    phone = str(phone)
+    if phone.endswith(".0") and phone[:-2].isdigit():  # a float that went through TEXT affinity
+        return phone[:-2]
+    if 'e+' in phone:
+        try:
+            return str(int(float(phone)))
+        except ValueError:
+            pass
+    return phone.translate(_PHONE_STRIP)
+
+def format_phone_number(phone_str):
+    """Phone numbers are normalized when written, so reading is a no-op"""
+    return phone_str or ""
+
+def _migrate_phone_numbers(conn):
+    """One-off rewrite of rows stored before normalize_phone_number existed"""
+    rows = conn.execute(SQL_SELECT_UNNORMALIZED_PHONES).fetchall()
+    updates = [(normalize_phone_number(phone), user_id) for user_id, phone in rows]
+    updates = [(phone, user_id) for (phone, user_id), (_, old) in zip(updates, rows) if phone != old]
+    if updates:
+        conn.executemany(SQL_UPDATE_PHONE, updates)
+        conn.commit()
+        print(f"📝 Normalized {len(updates)} stored phone numbers")
 
 # ====== SESSION MANAGEMENT ======
 
 def get_current_user():
     """Get the currently logged in user"""
-    return current_user_session if current_user_session else None
+    return _current_user.get()
 
 def set_current_user(user_data):
     """Set the current user session"""
-    global current_user_session
-    current_user_session = user_data
+    _current_user.set(user_data or None)
 
 def clear_current_user():
     """Clear the current user session"""
-    global current_user_session
-    current_user_session = {}
+    _current_user.set(None)
 
 # ====== BRUTE FORCE PROTECTION ======
 
@@ -266,12 +435,11 @@ MAX_ATTEMPTS = 5
 LOCKOUT_SECONDS = 60
 
 def is_locked_out(username):
-    ensure_database_exists()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT attempts, last_attempt FROM login_attempts WHERE username=?", (username,))
-    row = cursor.fetchone()
-    conn.close()
+    _ensure_db()
+    with _CONN_LOCK:
+        cursor = get_conn().cursor()
+        cursor.execute(SQL_SELECT_ATTEMPTS, (username,))
+        row = cursor.fetchone()
 
     if not row:
         return False
@@ -287,28 +455,26 @@ def is_locked_out(username):
     return True
 
 def get_lockout_remaining_time(username):
-    ensure_database_exists()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT last_attempt FROM login_attempts WHERE username=?", (username,))
-    row = cursor.fetchone()
-    conn.close()
+    _ensure_db()
+    with _CONN_LOCK:
+        cursor = get_conn().cursor()
+        cursor.execute(SQL_SELECT_ATTEMPTS, (username,))
+        row = cursor.fetchone()
     
     if not row:
         return 0
     
-    last_time = row[0]
+    last_time = row[1]
     elapsed = time.time() - last_time
     remaining = max(0, LOCKOUT_SECONDS - elapsed)
     return int(remaining)
 
 def get_remaining_attempts(username):
-    ensure_database_exists()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT attempts FROM login_attempts WHERE username=?", (username,))
-    row = cursor.fetchone()
-    conn.close()
+    _ensure_db()
+    with _CONN_LOCK:
+        cursor = get_conn().cursor()
+        cursor.execute(SQL_SELECT_ATTEMPTS, (username,))
+        row = cursor.fetchone()
     
     if not row:
         return MAX_ATTEMPTS
@@ -317,79 +483,200 @@ def get_remaining_attempts(username):
     return max(0, MAX_ATTEMPTS - attempts)
 
 def record_login_attempt(username, success):
-    ensure_database_exists()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    _ensure_db()
     now = time.time()
 
-    if success:
-        cursor.execute("DELETE FROM login_attempts WHERE username=?", (username,))
-    else:
-        cursor.execute("INSERT OR IGNORE INTO login_attempts (username, attempts, last_attempt) VALUES (?, 0, ?)", (username, now))
-        cursor.execute("UPDATE login_attempts SET attempts = attempts + 1, last_attempt=? WHERE username=?", (now, username))
+    with _CONN_LOCK:
+        conn = get_conn()
+        cursor = conn.cursor()
+        if success:
+            cursor.execute(SQL_DELETE_ATTEMPTS, (username,))
+        else:
+            cursor.execute(SQL_UPSERT_ATTEMPT, (username, now))
 
-    conn.commit()
-    conn.close()
+        conn.commit()
 
 def reset_attempts(username):
-    ensure_database_exists()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM login_attempts WHERE username=?", (username,))
-    conn.commit()
-    conn.close()
+    _ensure_db()
+    with _CONN_LOCK:
+        conn = get_conn()
+        conn.execute(SQL_DELETE_ATTEMPTS, (username,))
+        conn.commit()
 
 # ====== TRANSACTION LOGGING ======
 
-def log_transaction(sender, recipient, amount, channel="manual", is_fraud=False, is_phishing=False, txn_id=None, status="completed"):
-    """Log transaction to database"""
-    ensure_database_exists()
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+# log_transaction commits each row before returning. Callers that can tolerate a short
+# delay (offline/queued rows) may pass buffered=True: those rows are written with one
+# executemany per flush, when TXN_FLUSH_SIZE rows are waiting or TXN_FLUSH_INTERVAL
+# seconds after the first one. Bulk paths should use log_transactions_bulk instead.
+TXN_FLUSH_SIZE = 64
+TXN_FLUSH_INTERVAL = 0.5
+_pending_txns = deque()
+_flush_timer = None
+
+def flush_transactions():
+    """Write all buffered transactions in a single commit; returns the number written"""
+    global _flush_timer
+    with _CONN_LOCK:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        if not _pending_txns:
+            return 0
+        rows = list(_pending_txns)
+        conn = get_conn()
+        with conn:
+            conn.executemany(SQL_INSERT_TRANSACTION, rows)
+        _pending_txns.clear()  # only once written; a failed flush keeps the rows for the next one
+    return len(rows)
+
+def _flush_transactions_timer():
+    try:
+        flush_transactions()
+    except Exception as e:
+        print(f"⚠️ Transaction flush failed: {e}")
+
+def _queue_transactions(rows):
+    global _flush_timer
+    with _CONN_LOCK:
+        _pending_txns.extend(rows)
+        if len(_pending_txns) >= TXN_FLUSH_SIZE:
+            flush_transactions()
+        elif _flush_timer is None:
+            _flush_timer = threading.Timer(TXN_FLUSH_INTERVAL, _flush_transactions_timer)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+atexit.register(flush_transactions)
+
+def log_transaction(sender, recipient, amount, channel="manual", is_fraud=False, is_phishing=False, txn_id=None, status="completed", buffered=False):
+    """Log transaction to database.
+
+    The row is committed before this returns unless buffered=True, in which case it is
+    queued for the next flush (see flush_transactions).
+    """
+    _ensure_db()
 
     if not txn_id:
         txn_id = f"TXN_{int(time.time())}"
     
-    time_str = datetime.now().isoformat()
-    
-    cursor.execute('''
-        INSERT INTO transactions (sender, recipient, amount, time, channel,
-            is_fraud, is_phishing, status, txn_id, synced)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
-    ''', (
+    time_str = _now_iso()
+    row = (
         sender, recipient, amount, time_str, channel,
         int(is_fraud), int(is_phishing), status, txn_id
-    ))
-
-    conn.commit()
-    conn.close()
+    )
+    
+    if buffered:
+        _queue_transactions((row,))
+        print(f"🕓 Transaction queued: {txn_id}")
+        return txn_id
+
+    with _CONN_LOCK:
+        flush_transactions()  # keep queued rows ahead of this one
+        conn = get_conn()
+        with conn:
+            conn.execute(SQL_INSERT_TRANSACTION, row)
     print(f"📝 Transaction logged: {txn_id}")
     return txn_id
 
+def log_transactions_bulk(txns):
+    """Log many transactions in one transaction (single commit) via executemany.
+
+    Each item is a dict with the same fields as log_transaction's arguments.
+    Anything still buffered by log_transaction goes out in the same commit.
+    """
+    _ensure_db()
+    if not txns:
+        return []
+
+    time_str = _now_iso()
+    base_id = int(time.time())
+    rows = []
+    txn_ids = []
+    for i, txn in enumerate(txns):
+        txn_id = txn.get("txn_id") or f"TXN_{base_id}_{i}"
+        txn_ids.append(txn_id)
+        rows.append((
+            txn.get("sender"), txn.get("recipient"), txn.get("amount"), time_str,
+            txn.get("channel", "manual"), int(txn.get("is_fraud", False)),
+            int(txn.get("is_phishing", False)), txn.get("status", "completed"), txn_id
+        ))
+
+    with _CONN_LOCK:
+        _pending_txns.extend(rows)
+        flush_transactions()
+    print(f"📝 {len(rows)} transactions logged")
+    return txn_ids
+
+def fetch_unsynced_txns(batch_size=256):
+    """Yield unsynced transaction rows, reading batch_size rows at a time.
+
+    Uses its own connection: the generator may stay open while the shared one is in use.
+    """
+    _ensure_db()
+    flush_transactions()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.execute(SQL_SELECT_UNSYNCED)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+# Stay well under SQLite's bound-parameter limit (999 on older builds)
+MARK_SYNCED_CHUNK = 500
+
+def mark_synced(txn_ids):
+    """Flag transactions as synced: one IN-list UPDATE per chunk, all in a single commit"""
+    _ensure_db()
+    txn_ids = list(txn_ids)
+    if not txn_ids:
+        return 0
+
+    updated = 0
+    with _CONN_LOCK:
+        flush_transactions()
+        conn = get_conn()
+        with conn:
+            for i in range(0, len(txn_ids), MARK_SYNCED_CHUNK):
+                chunk = txn_ids[i:i + MARK_SYNCED_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"UPDATE transactions SET synced=1 WHERE txn_id IN ({placeholders})", chunk
+                )
+                updated += cursor.rowcount
+    return updated
+
 def get_transaction_count(username):
     """Get total transaction count for a user"""
-    ensure_database_exists()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT COUNT(*) FROM transactions 
-        WHERE sender=? OR recipient=?
-    ''', (username, username))
-    count = cursor.fetchone()[0]
-    conn.close()
+    _ensure_db()
+    with _CONN_LOCK:
+        flush_transactions()
+        cursor = get_conn().execute(SQL_COUNT_USER_TRANSACTIONS, (username, username, username))
+        count = cursor.fetchone()[0]
     return count
 
 # ====== UTILITY FUNCTIONS ======
 
-def get_all_users():
-    """Get all users for debugging"""
-    ensure_database_exists()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, username, phone_number, created_at, last_login FROM users")
-    rows = cursor.fetchall()
-    conn.close()
+def get_all_users(limit=100, after_id=0):
+    """Get one page of users; pass the last row's id as after_id for the next page"""
+    _ensure_db()
+    with _CONN_LOCK:
+        cursor = get_conn().cursor()
+        cursor.execute(SQL_SELECT_USERS_PAGE, (after_id, limit))
+        rows = cursor.fetchall()
+    return rows
+
+def _get_all_users_unpaginated():
+    """Every user in one list - only for the debug listing below"""
+    _ensure_db()
+    with _CONN_LOCK:
+        cursor = get_conn().cursor()
+        cursor.execute(SQL_SELECT_ALL_USERS)
+        rows = cursor.fetchall()
     return rows
 
 # ====== INITIALIZATION ON MODULE LOAD ======
@@ -407,7 +694,7 @@ if __name__ == "__main__":
     print(f"📂 Database location: {DB_PATH}")
     
     # Show existing users
-    users = get_all_users()
+    users = _get_all_users_unpaginated()
     if users:
         print("\n👥 Existing users:")
         for user in users:
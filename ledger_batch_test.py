@@ -0,0 +1,157 @@
+# ledger_batch_test.py - Checks for the buffered / batched ledger paths
+# Runs against a throwaway database, so it is safe to run next to a real ledger.db
+
+import os
+import sqlite3
+import tempfile
+
+import ledger
+
+def use_temp_database():
+    """Point the ledger at a fresh temp db (the shared connection is reopened on first use)"""
+    tmp_dir = tempfile.mkdtemp(prefix="paymesh_ledger_")
+    ledger.flush_transactions()
+    ledger.DB_PATH = os.path.join(tmp_dir, "ledger.db")
+    ledger._CONN = None
+    ledger._initialized = False
+    ledger.ensure_database_exists()
+    ledger.BCRYPT_ROUNDS = 4  # keep hashing fast; real deployments use PAYMESH_BCRYPT_ROUNDS
+    return ledger.DB_PATH
+
+def count_on_new_connection(username):
+    """What sync_server or trust_score would see right now"""
+    conn = sqlite3.connect(ledger.DB_PATH)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM transactions WHERE sender=? OR recipient=?", (username, username)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+def test_log_transaction():
+    # Plain log_transaction is committed before it returns
+    ledger.log_transaction("alice", "bob", 100, status="Success")
+    assert not ledger._pending_txns
+    assert count_on_new_connection("alice") == 1
+
+    # Buffered rows wait for a flush; counting flushes first, so they are never missed
+    ledger.log_transaction("bob", "alice", 50, status="Queued", buffered=True)
+    assert len(ledger._pending_txns) == 1, "buffered rows should wait in the buffer"
+    assert count_on_new_connection("alice") == 1
+    assert ledger.get_transaction_count("alice") == 2
+    assert not ledger._pending_txns
+    assert count_on_new_connection("alice") == 2
+
+    # A full buffer is written without waiting for the timer
+    for i in range(ledger.TXN_FLUSH_SIZE):
+        ledger.log_transaction("carol", "dave", i, txn_id=f"TXN_FULL_{i}", buffered=True)
+    assert not ledger._pending_txns
+    assert count_on_new_connection("carol") == ledger.TXN_FLUSH_SIZE
+    print("✅ Durable and buffered log_transaction")
+
+def test_login_cache_and_lockout():
+    assert ledger.create_user("grace", "right-password", "9000000000")["success"]
+    ledger._login_cache.clear()
+
+    assert ledger.verify_user("grace", "right-password")["success"]
+    assert len(ledger._login_cache) == 1
+    assert ledger.verify_user("grace", "right-password")["success"]  # cache hit
+    assert len(ledger._login_cache) == 1
+
+    # Wrong passwords are never cached and count towards the lockout
+    for _ in range(ledger.MAX_ATTEMPTS):
+        assert not ledger.verify_user("grace", "wrong-password")["success"]
+    assert len(ledger._login_cache) == 1
+    locked = ledger.verify_user("grace", "right-password")
+    assert locked.get("locked") and not locked["success"]
+    print("✅ Login cache and lockout")
+
+def test_rehash_on_login():
+    assert ledger.create_user("heidi", "right-password")["success"]
+    assert ledger.verify_user("heidi", "right-password")["success"]
+
+    # A changed cost factor re-hashes on the next login; the new hash retires the cache entry
+    ledger.BCRYPT_ROUNDS = 5
+    assert ledger.verify_user("heidi", "right-password")["success"]
+    stored = ledger.get_conn().execute(
+        "SELECT password_hash FROM users WHERE username='heidi'"
+    ).fetchone()[0]
+    assert ledger._hash_rounds(stored) == 5
+    assert ledger.verify_user("heidi", "right-password")["success"]
+    ledger.BCRYPT_ROUNDS = 4
+    print("✅ Rehash on a changed bcrypt cost")
+
+def test_phone_normalization():
+    assert ledger.normalize_phone_number(919876543210.0) == "919876543210"
+    assert ledger.normalize_phone_number("919876543210.0") == "919876543210"
+    assert ledger.normalize_phone_number("9.19876543210e+11") == "919876543210"
+    assert ledger.normalize_phone_number("+91 98765-43210") == "+919876543210"
+    assert ledger.normalize_phone_number("(987) 654 3210") == "9876543210"
+    assert ledger.normalize_phone_number(None) == ""
+
+    assert ledger.create_user("ivan", "secret123", "+91 90000 00000")["success"]
+    result = ledger.verify_user("ivan", "secret123")
+    assert result["user_data"]["phone_number"] == "+919000000000"
+
+    # Rows written before normalization existed are rewritten once
+    conn = ledger.get_conn()
+    raw = [("legacy_float", 919876543210.0), ("legacy_sci", "9.19876543210e+11"),
+           ("legacy_dash", "+91 98765-43210"), ("legacy_ok", "+919876543210")]
+    with conn:
+        conn.executemany(
+            "INSERT INTO users (username, password_hash, phone_number) VALUES (?, 'x', ?)", raw
+        )
+    ledger._migrate_phone_numbers(conn)
+    stored = dict(conn.execute(
+        "SELECT username, phone_number FROM users WHERE username LIKE 'legacy_%'"
+    ).fetchall())
+    assert stored == {
+        "legacy_float": "919876543210",
+        "legacy_sci": "919876543210",
+        "legacy_dash": "+919876543210",
+        "legacy_ok": "+919876543210",
+    }, stored
+    print("✅ Phone normalization and migration")
+
+def test_bulk_log_and_sync():
+    already_unsynced = len(list(ledger.fetch_unsynced_txns()))
+    txn_ids = ledger.log_transactions_bulk([
+        {"sender": "erin", "recipient": "frank", "amount": 10},
+        {"sender": "erin", "recipient": "frank", "amount": 20, "txn_id": "TXN_BULK"},
+    ])
+    assert txn_ids[1] == "TXN_BULK" and len(set(txn_ids)) == 2
+    assert count_on_new_connection("erin") == 2
+
+    unsynced = list(ledger.fetch_unsynced_txns(batch_size=3))
+    assert len(unsynced) == already_unsynced + 2
+
+    # Force several IN-list chunks
+    ledger.MARK_SYNCED_CHUNK = 7
+    assert ledger.mark_synced([row[7] for row in unsynced]) == len(unsynced)
+    assert list(ledger.fetch_unsynced_txns()) == []
+    ledger.MARK_SYNCED_CHUNK = 500
+    print("✅ Bulk logging, streamed fetch and chunked mark_synced")
+
+def test_keyset_pagination():
+    for i in range(5):
+        assert ledger.create_user(f"page_user_{i}", "secret123")["success"]
+
+    paged, after_id = [], 0
+    while True:
+        page = ledger.get_all_users(limit=2, after_id=after_id)
+        if not page:
+            break
+        paged.extend(page)
+        after_id = page[-1][0]
+    assert paged == ledger._get_all_users_unpaginated()
+    print("✅ Keyset get_all_users")
+
+if __name__ == "__main__":
+    print(f"🧪 Using temp ledger: {use_temp_database()}")
+    test_log_transaction()
+    test_login_cache_and_lockout()
+    test_rehash_on_login()
+    test_phone_normalization()
+    test_bulk_log_and_sync()
+    test_keyset_pagination()
+    print("🎉 All ledger checks passed")
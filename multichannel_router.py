@@ -3,14 +3,23 @@
 from connectivity_checker import connectivity_checker
 from bluetooth_scanner import bluetooth_scanner
 from twilio_sms_sender import twilio_sms_sender
+import copy
+import os
+import threading
 import time
 from datetime import datetime
 
+# Set PAYMESH_SIMULATE=1 to add the demo gateway/BLE delays back in; off by default so the
+# placeholder channels don't cap throughput
+SIMULATE = os.getenv("PAYMESH_SIMULATE", "0") == "1"
+
 class RealMultiChannelRouter:
     def __init__(self):
         self.channel_priority = ["online", "bluetooth", "sms", "local"]
-        self.last_connectivity_check = None
+        self.last_connectivity_check = None  # monotonic time of the cached channel check
         self.connectivity_cache_duration = 30  # seconds
+        self._channel_status = None
+        self._channel_lock = threading.Lock()
         
     def process_transaction_with_real_fallback(self, recipient, amount, sender_data):
         """Process transaction with real connectivity checks and fallback"""
@@ -38,7 +47,7 @@ class RealMultiChannelRouter:
                 
             print(f"🔄 Attempting {channel} channel...")
             
-            result = self._attempt_real_channel_payment(channel, recipient, amount, transaction_data)
+            result = self._attempt_real_channel_payment(channel, recipient, amount, transaction_data, channel_status)
             
             if result["success"]:
                 print(f"✅ Transaction successful via {channel}")
@@ -48,6 +57,8 @@ class RealMultiChannelRouter:
                 return result
             else:
                 print(f"❌ {channel} failed: {result.get('error', 'Unknown error')}")
+                # The cached status said this channel was up; re-check on the next payment
+                self._invalidate_channel_cache()
         
         # All channels failed
         return {
@@ -59,6 +70,24 @@ class RealMultiChannelRouter:
         }
     
     def _check_all_channels(self):
+        """Channel availability, re-checked at most once per connectivity_cache_duration.
+
+        Concurrent callers share one check (the lock is held while probing), and each
+        gets its own copy, since the status is attached to the returned results.
+        """
+        with self._channel_lock:
+            now = time.monotonic()
+            if (self._channel_status is None
+                    or now - self.last_connectivity_check >= self.connectivity_cache_duration):
+                self._channel_status = self._check_all_channels_uncached()
+                self.last_connectivity_check = time.monotonic()
+            return copy.deepcopy(self._channel_status)
+    
+    def _invalidate_channel_cache(self):
+        with self._channel_lock:
+            self._channel_status = None
+    
+    def _check_all_channels_uncached(self):
         """Check real availability of all channels"""
         
         # Check internet connectivity
@@ -87,7 +116,7 @@ class RealMultiChannelRouter:
             }
         }
     
-    def _attempt_real_channel_payment(self, channel, recipient, amount, transaction_data):
+    def _attempt_real_channel_payment(self, channel, recipient, amount, transaction_data, channel_status=None):
         """Attempt payment through specific channel with real implementations"""
         
         if channel == "online":
@@ -95,8 +124,11 @@ class RealMultiChannelRouter:
             return self._process_online_payment(recipient, amount, transaction_data)
         
         elif channel == "bluetooth":
-            # Real Bluetooth payment
-            return self._process_bluetooth_payment(recipient, amount, transaction_data)
+            # Real Bluetooth payment, reusing the devices found by the channel check
+            devices = None
+            if channel_status is not None:
+                devices = channel_status["detailed_info"]["bluetooth_scan"]["devices"]
+            return self._process_bluetooth_payment(recipient, amount, transaction_data, devices)
         
         elif channel == "sms":
             # Real SMS via Twilio
@@ -113,7 +145,8 @@ class RealMultiChannelRouter:
         # Here you would integrate with actual payment gateways
         # For now, simulate success
         print("🌐 Processing online payment...")
-        time.sleep(1)
+        if SIMULATE:
+            time.sleep(1)
         
         return {
             "success": True,
@@ -122,25 +155,27 @@ class RealMultiChannelRouter:
             "gateway": "simulation"
         }
     
-    def _process_bluetooth_payment(self, recipient, amount, transaction_data):
-        """Process Bluetooth payment using real device scan"""
-        bluetooth_result = bluetooth_scanner.scan_for_devices()
+    def _process_bluetooth_payment(self, recipient, amount, transaction_data, devices=None):
+        """Process Bluetooth payment using real device scan (skipped if devices are passed in)"""
+        if devices is None:
+            devices = bluetooth_scanner.scan_for_devices()["devices"]
         
-        if not bluetooth_result["devices"]:
+        if not devices:
             return {
                 "success": False,
                 "error": "No Bluetooth payment devices found"
             }
         
         # Find best device (highest confidence)
-        best_device = max(bluetooth_result["devices"], key=lambda d: d.get("confidence", 0))
+        best_device = max(devices, key=lambda d: d.get("confidence", 0))
         
         print(f"🔵 Using Bluetooth device: {best_device['name']}")
         print(f"   Address: {best_device['address']}")
         print(f"   Confidence: {best_device['confidence']:.2f}")
         
         # Simulate payment processing
-        time.sleep(0.1)  # Fast BLE transaction
+        if SIMULATE:
+            time.sleep(0.1)  # Fast BLE transaction
         
         return {
             "success": True,
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
+import importlib.util
+import logging
 import os
 import re
 import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from pathlib import Path
+from types import MappingProxyType
 
-import numpy as np
-import sounddevice as sd
-import speech_recognition as sr
-import wavio
-from gtts import gTTS
 from kivy.app import App
 from kivy.animation import Animation
 from kivy.clock import Clock
@@ -27,21 +27,17 @@ from kivy.uix.spinner import Spinner
 from kivy.uix.textinput import TextInput
 from playsound import playsound
 
-# Audio library imports
+# Audio libraries (sounddevice, speech_recognition, wavio, pyttsx3, gTTS) pull in
+# PortAudio/numpy and are only needed once the user records or listens, so they are
+# imported inside the functions that use them; here we only check they are installed.
 import platform
-import subprocess
-try:
-    import pyttsx3
-    PYTTSX3_AVAILABLE = True
-except ImportError:
-    PYTTSX3_AVAILABLE = False
+
+PYTTSX3_AVAILABLE = importlib.util.find_spec("pyttsx3") is not None
+if not PYTTSX3_AVAILABLE:
     print("⚠️ pyttsx3 not available. Install with: pip install pyttsx3")
 
-try:
-    from gtts import gTTS
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
+GTTS_AVAILABLE = importlib.util.find_spec("gtts") is not None
+if not GTTS_AVAILABLE:
     print("⚠️ gtts not available. Install with: pip install gtts")
 
 # VOICE AMOUNT EXTRACTION FIX
@@ -54,13 +50,98 @@ from backend_integration import backend
 # GLOBAL CONSTANTS
 # --------------------------------------------------------------------------- #
 
-Window.clearcolor = (0 / 255, 196 / 255, 204 / 255, 1)
-
-LANGUAGE_CODES = {"English": "en", "Tamil": "ta", "Hindi": "hi"}
-TTS_CODES = LANGUAGE_CODES
+# Theme colours, shared by every screen, button and popup
+CLEAR_BG = (0 / 255, 196 / 255, 204 / 255, 1)
+ACCENT_BG = (0 / 255, 229 / 255, 212 / 255, 1)
+TEXT_WHITE = (1, 1, 1, 1)
+TEXT_BLACK = (0, 0, 0, 1)
+STATUS_ERROR = (1, 107 / 255, 107 / 255, 1)  # #FF6B6B
+
+Window.clearcolor = CLEAR_BG
+
+# Backend calls from the UI share these workers instead of starting a thread each;
+# long-running audio work (recording, TTS, beep) keeps its own daemon threads
+_BG_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="paymesh-bg")
+
+# (status key, label) pairs shown on SendScreen, in display order
+_CHANNEL_LABELS = (
+    ("online", "🌐 Online"),
+    ("bluetooth", "🔵 Bluetooth"),
+    ("sms", "📱 SMS"),
+    ("local", "💾 Local"),
+)
+_SECURITY_LABELS = (
+    ("phishing_detector", "SVM Phishing"),
+    ("fraud_scoring", "Fraud ML"),
+    ("sms_phishing_verifier", "SMS Verification"),
+    ("trust_score", "Trust Scoring"),
+)
+
+# Popup bodies: the static text is joined once here, each tap only runs .format()
+_SYSTEM_STATUS_TEMPLATE = "\n".join((
+    "PayMesh Enhanced Security System:",
+    "",
+    "Backend: {backend}",
+    "",
+    "4-Layer ML Security Pipeline:",
+    "• Traditional Phishing: {phishing}",
+    "• Fraud Detection: {fraud}",
+    "• Trust Scoring: {trust}",
+    "• SMS Verification: {sms_verification}",
+    "",
+    "Enhanced Security: {enhanced_security}",
+    "",
+    "Communication Channels:",
+    "• Multi-Channel Router: {router}",
+    "• SMS (Twilio): {sms}",
+    "• Bluetooth Scanner: {bluetooth}",
+    "• Connectivity Checker: {connectivity}",
+    "",
+    "Analytics:",
+    "• Fraud Visualization: {fraud_visualization}",
+    "",
+    "Current User: {current_user}",
+    "",
+    "SMS Security Features:",
+    "• Pre-payment SMS analysis using SVM model",
+    "• 4 SMS templates verified per transaction",
+    "• Real-time phishing pattern detection",
+    "• Payment confirmation SMS notifications",
+))
+
+_SMS_STATS_TEMPLATE = "\n".join((
+    "SMS Phishing Verification Statistics:",
+    "",
+    "Model Status: {model_status}",
+    "Model Type: {model_type}",
+    "",
+    "Verification Summary:",
+    "• Total Verifications: {total}",
+    "• Approved Payments: {approved}",
+    "• Blocked Payments: {blocked}",
+    "• Approval Rate: {approval_rate:.1f}%",
+    "",
+    "Risk Analysis:",
+    "• Average Risk Score: {avg_risk:.3f}/1.0",
+    "• Threshold Used: 0.4 (40%)",
+    "",
+    "SMS Security Features:",
+    "• Pre-payment SMS analysis",
+    "• 4 templates checked per transaction",
+    "• Real-time SVM classification",
+    "• Automatic phishing detection",
+    "• Payment confirmation notifications",
+))
+
+# Read-only: shared by speech recognition and TTS
+LANGUAGE_CODES = MappingProxyType({"English": "en", "Tamil": "ta", "Hindi": "hi"})
 BEEP_FILE = "beep.mp3"
 LOGO_FILE = "assets/logo.png"
 
+# Bundled assets don't appear or vanish while the app runs: stat them once
+_BEEP_EXISTS = Path(BEEP_FILE).is_file()
+_LOGO_EXISTS = Path(LOGO_FILE).is_file()
+
 # --------------------------------------------------------------------------- #
 # HELPER FUNCTIONS - COMPLETELY FIXED WITH SMS SUPPORT
 # --------------------------------------------------------------------------- #
@@ -82,112 +163,203 @@ def extract_amount_from_text(text):
     except Exception:
         return None
 
+@lru_cache(maxsize=1)
+def _load_beep():
+    """Decode beep.mp3 into an in-memory PCM buffer (None if it can't be played that way).
+
+    Warmed on a background worker when the app builds, so the first recording skips the decode.
+    """
+    if not _BEEP_EXISTS or importlib.util.find_spec("sounddevice") is None:
+        return None
+    try:
+        import soundfile
+
+        data, samplerate = soundfile.read(BEEP_FILE, dtype="int16")
+        return data, samplerate
+    except Exception:
+        return None
+
 def play_beep() -> None:
-    if Path(BEEP_FILE).is_file():
+    beep = _load_beep()
+    if beep is not None:
+        import sounddevice as sd
+
+        sd.play(*beep)  # non-blocking: copies the buffer into the audio stream
+    elif _BEEP_EXISTS:
         threading.Thread(target=playsound, args=(BEEP_FILE,), daemon=True).start()
 
+def _ttl_cache(fn, ttl=2.0):
+    """Reuse fn's last result for ttl seconds (screens switching or double taps hit the backend once)"""
+    cached = (float("-inf"), None)  # (monotonic time, value), swapped as one tuple
+
+    @wraps(fn)
+    def wrapper():
+        nonlocal cached
+        now = time.monotonic()
+        if now - cached[0] > ttl:
+            cached = (now, fn())
+        return cached[1]
+
+    return wrapper
+
+# System status shared by StartScreen's status line and popup. Connectivity isn't wrapped:
+# backend.check_connection_status already reuses its result for a few seconds.
+_cached_system_status = _ttl_cache(backend.get_system_status)
+
+def _mark(flag) -> str:
+    return '✅' if flag else '❌'
+
 def safe_remove(path: str | Path) -> None:
     try:
         Path(path).unlink(missing_ok=True)
     except Exception:
         pass
 
-def show_simple_popup(title: str, message: str) -> None:
-    popup = Popup(
-        title=title,
-        content=Label(text=message, color=(1, 1, 1, 1)),
+# Popups are built on first use (after the Window exists) and then reused; each call only
+# swaps the title/text and reopens. A popup opened while the pooled one is still on screen
+# gets a fresh instance (an open ModalView has the Window as its parent).
+_SIMPLE_POPUP = None
+_DETAILED_POPUP = None
+
+def _new_simple_popup():
+    return Popup(
+        content=Label(color=TEXT_WHITE),
         size_hint=(0.7, 0.35),
-        background_color=(0 / 255, 196 / 255, 204 / 255, 1),
+        background_color=CLEAR_BG,
     )
-    popup.open()
 
-def show_detailed_popup(title: str, message: str, details: str = "") -> None:
-    """Enhanced popup with transaction and SMS verification details"""
-    full_message = f"{message}\n\n{details}" if details else message
-    popup = Popup(
-        title=title,
+def _new_detailed_popup():
+    return Popup(
         content=Label(
-            text=full_message,
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
             text_size=(450, None),
             halign="left"
         ),
         size_hint=(0.9, 0.8),
-        background_color=(0 / 255, 196 / 255, 204 / 255, 1),
+        background_color=CLEAR_BG,
     )
+
+def _open_popup(popup, title, text):
+    popup.title = title
+    popup.content.text = text
     popup.open()
 
+def show_simple_popup(title: str, message: str) -> None:
+    global _SIMPLE_POPUP
+    if _SIMPLE_POPUP is None:
+        _SIMPLE_POPUP = _new_simple_popup()
+    popup = _SIMPLE_POPUP if _SIMPLE_POPUP.parent is None else _new_simple_popup()
+    _open_popup(popup, title, message)
+
+def show_detailed_popup(title: str, message: str, details: str = "") -> None:
+    """Enhanced popup with transaction and SMS verification details"""
+    global _DETAILED_POPUP
+    full_message = f"{message}\n\n{details}" if details else message
+    if _DETAILED_POPUP is None:
+        _DETAILED_POPUP = _new_detailed_popup()
+    popup = _DETAILED_POPUP if _DETAILED_POPUP.parent is None else _new_detailed_popup()
+    _open_popup(popup, title, full_message)
+
 def logo_widget(size_hint=(1, 0.6)):
-    if Path(LOGO_FILE).is_file():
+    if _LOGO_EXISTS:
         return Image(source=LOGO_FILE, size_hint=size_hint, allow_stretch=True, keep_ratio=True)
-    return Label(text="PayMesh", font_size=40, color=(1, 1, 1, 1), size_hint=size_hint)
+    return Label(text="PayMesh", font_size=40, color=TEXT_WHITE, size_hint=size_hint)
+
+# Keys tried in order when a backend field comes back as a dict
+_PREFERRED_KEYS = ("message", "name", "value")
+_MISSING = object()
+
+def _fmt_dict(value, default):
+    for key in _PREFERRED_KEYS:
+        item = value.get(key, _MISSING)
+        if item is not _MISSING:
+            return str(item)
+    return str(value)
+
+def _fmt_list(value, default):
+    return ', '.join(map(str, value))
+
+# Exact-type dispatch for safe_format_value (one hash lookup instead of an isinstance chain)
+_FORMATTERS = {
+    type(None): lambda value, default: default,
+    dict: _fmt_dict,
+    list: _fmt_list,
+    str: lambda value, default: value,
+}
 
 def safe_format_value(value, default="Unknown"):
     """COMPLETELY FIXED: Safely format any value for display"""
     try:
-        if value is None:
-            return default
-        elif isinstance(value, dict):
-            if 'message' in value:
-                return str(value['message'])
-            elif 'name' in value:
-                return str(value['name'])
-            elif 'value' in value:
-                return str(value['value'])
-            else:
-                return str(value)
-        elif isinstance(value, list):
-            return ', '.join(str(item) for item in value)
-        else:
-            return str(value)
+        fmt = _FORMATTERS.get(type(value))
+        if fmt is not None:
+            return fmt(value, default)
+        # Subclasses (OrderedDict etc.) take the slow path
+        if isinstance(value, dict):
+            return _fmt_dict(value, default)
+        if isinstance(value, list):
+            return _fmt_list(value, default)
+        return str(value)
     except Exception:
         return default
 
 def safe_format_number(value, default=0.0):
     """Safely format numeric values for calculations"""
-    try:
-        if isinstance(value, (int, float)):
-            return float(value)
-        elif isinstance(value, str):
+    t = type(value)
+    if t is float:
+        return value
+    if t is int or t is bool:
+        return float(value)
+    if t is str:
+        try:
             return float(value)
-        elif isinstance(value, dict):
-            return 0.0
-        else:
+        except ValueError:
             return default
-    except Exception:
-        return default
+    if t is dict:
+        return 0.0  # dict-shaped results count as zero whatever the default
+    # numpy scalars and other numeric subclasses
+    if isinstance(value, (int, float)):
+        return float(value)
+    return default
 
 # --------------------------------------------------------------------------- #
 # ENHANCED SCREENS WITH SMS VERIFICATION INTEGRATION
 # --------------------------------------------------------------------------- #
 
-class StartScreen(Screen):
+class _ThemedScreen(Screen):
+    """Screen with the full-size CLEAR_BG background every PayMesh screen uses"""
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
         with self.canvas.before:
-            Color(*Window.clearcolor)
+            Color(*CLEAR_BG)
             self.rect = Rectangle(size=self.size, pos=self.pos)
             self.bind(size=self._update_rect, pos=self._update_rect)
 
+    def _update_rect(self, *_):
+        self.rect.pos, self.rect.size = self.pos, self.size
+
+class StartScreen(_ThemedScreen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
         layout = BoxLayout(orientation="vertical", padding=50, spacing=20)
 
         logo = logo_widget()
         layout.add_widget(logo)
 
         # Backend status indicator with SMS verification info
-        self.status_label = Label(text="Initializing SMS Security...", font_size=16, color=(1, 1, 1, 1))
+        self.status_label = Label(text="Initializing SMS Security...", font_size=16, color=TEXT_WHITE)
         layout.add_widget(self.status_label)
 
         layout.add_widget(
-            Label(text="Secure Offline Payments with SMS Phishing Verification", font_size=22, color=(1, 1, 1, 1))
+            Label(text="Secure Offline Payments with SMS Phishing Verification", font_size=22, color=TEXT_WHITE)
         )
 
         start_btn = Button(
             text="Get Started",
             size_hint=(0.5, 0.2),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         start_btn.bind(on_press=self.go_to_login)
         layout.add_widget(start_btn)
@@ -197,7 +369,7 @@ class StartScreen(Screen):
             text="System Status",
             size_hint=(0.5, 0.1),
             background_color=(0.5, 0.5, 0.5, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         info_btn.bind(on_press=self.show_system_status)
         layout.add_widget(info_btn)
@@ -212,13 +384,10 @@ class StartScreen(Screen):
         # Check backend status on startup
         Clock.schedule_once(self.check_backend_status, 0.5)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def check_backend_status(self, *_):
         def status_check():
             try:
-                status = backend.get_system_status()
+                status = _cached_system_status()
                 backend_available = status.get("backend_available", False)
                 capabilities = status.get("capabilities", {})
 
@@ -235,12 +404,12 @@ class StartScreen(Screen):
             except Exception as e:
                 Clock.schedule_once(lambda *_: setattr(self.status_label, "text", "🔴 Backend Error"))
 
-        threading.Thread(target=status_check, daemon=True).start()
+        _BG_POOL.submit(status_check)
 
     def show_system_status(self, *_):
         def get_status():
             try:
-                status = backend.get_system_status()
+                status = _cached_system_status()
                 backend_available = status.get("backend_available", False)
                 capabilities = status.get("capabilities", {})
                 current_user = safe_format_value(status.get('current_user', 'Not logged in'))
@@ -249,34 +418,21 @@ class StartScreen(Screen):
                 sms_verification_status = "✅ Available" if capabilities.get("sms_phishing_verification", False) else "❌ Unavailable"
                 enhanced_security_status = "✅ Active" if capabilities.get("enhanced_security_pipeline", False) else "❌ Inactive"
 
-                status_details = f"""PayMesh Enhanced Security System:
-
-Backend: {'✅ Available' if backend_available else '❌ Offline'}
-
-4-Layer ML Security Pipeline:
-• Traditional Phishing: {'✅' if capabilities.get('ml_security_pipeline', False) else '❌'}
-• Fraud Detection: {'✅' if capabilities.get('ml_security_pipeline', False) else '❌'}
-• Trust Scoring: {'✅' if capabilities.get('ml_security_pipeline', False) else '❌'}
-• SMS Verification: {sms_verification_status}
-
-Enhanced Security: {enhanced_security_status}
-
-Communication Channels:
-• Multi-Channel Router: {'✅' if capabilities.get('multichannel_payments', False) else '❌'}
-• SMS (Twilio): {'✅' if capabilities.get('sms_notifications', False) else '❌'}
-• Bluetooth Scanner: {'✅' if capabilities.get('bluetooth_scanning', False) else '❌'}
-• Connectivity Checker: {'✅' if capabilities.get('real_connectivity_checks', False) else '❌'}
-
-Analytics:
-• Fraud Visualization: {'✅' if capabilities.get('fraud_visualization', False) else '❌'}
-
-Current User: {current_user}
-
-SMS Security Features:
-• Pre-payment SMS analysis using SVM model
-• 4 SMS templates verified per transaction
-• Real-time phishing pattern detection
-• Payment confirmation SMS notifications"""
+                ml_pipeline = _mark(capabilities.get('ml_security_pipeline', False))
+                status_details = _SYSTEM_STATUS_TEMPLATE.format(
+                    backend='✅ Available' if backend_available else '❌ Offline',
+                    phishing=ml_pipeline,
+                    fraud=ml_pipeline,
+                    trust=ml_pipeline,
+                    sms_verification=sms_verification_status,
+                    enhanced_security=enhanced_security_status,
+                    router=_mark(capabilities.get('multichannel_payments', False)),
+                    sms=_mark(capabilities.get('sms_notifications', False)),
+                    bluetooth=_mark(capabilities.get('bluetooth_scanning', False)),
+                    connectivity=_mark(capabilities.get('real_connectivity_checks', False)),
+                    fraud_visualization=_mark(capabilities.get('fraud_visualization', False)),
+                    current_user=current_user,
+                )
 
                 Clock.schedule_once(
                     lambda *_: show_detailed_popup("Enhanced System Status", "PayMesh Security Overview", status_details)
@@ -287,26 +443,21 @@ SMS Security Features:
                     lambda *_: show_simple_popup("Status Error", error_msg)
                 )
 
-        threading.Thread(target=get_status, daemon=True).start()
+        _BG_POOL.submit(get_status)
 
     def go_to_login(self, *_):
         self.manager.transition = FadeTransition()
         self.manager.current = "login"
 
-class LoginScreen(Screen):
+class LoginScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", padding=30, spacing=20)
 
         logo = logo_widget((1, 0.7))
         layout.add_widget(logo)
-        layout.add_widget(Label(text="Login Account", font_size=20, color=(1, 1, 1, 1)))
+        layout.add_widget(Label(text="Login Account", font_size=20, color=TEXT_WHITE))
 
         self.username = TextInput(
             hint_text="Username",
@@ -314,7 +465,7 @@ class LoginScreen(Screen):
             size_hint=(1, 0.2),
             font_size=24,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
 
         self.password = TextInput(
@@ -324,7 +475,7 @@ class LoginScreen(Screen):
             size_hint=(1, 0.2),
             font_size=24,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
 
         layout.add_widget(self.username)
@@ -339,8 +490,8 @@ class LoginScreen(Screen):
         login_btn = Button(
             text="Login",
             size_hint=(1, 0.15),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         login_btn.bind(on_press=self.authenticate_user)
         layout.add_widget(login_btn)
@@ -348,7 +499,7 @@ class LoginScreen(Screen):
         signup_btn = Button(
             text="New user? Sign up",
             background_color=(0, 0, 0, 0),
-            color=(0, 0, 0, 1),
+            color=TEXT_BLACK,
             font_size=18,
         )
         signup_btn.bind(on_press=self.go_to_signup)
@@ -356,9 +507,6 @@ class LoginScreen(Screen):
 
         self.add_widget(layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def authenticate_user(self, *_):
         """Enhanced authentication with real backend"""
         username = self.username.text.strip()
@@ -378,7 +526,7 @@ class LoginScreen(Screen):
                 error_result = {"success": False, "message": f"Authentication failed: {str(e)}"}
                 Clock.schedule_once(lambda *_: self._handle_auth_result(error_result))
 
-        threading.Thread(target=auth_process, daemon=True).start()
+        _BG_POOL.submit(auth_process)
 
     def _handle_auth_result(self, result):
         self.login_status.text = ""
@@ -399,20 +547,15 @@ class LoginScreen(Screen):
     def go_to_signup(self, *_):
         self.manager.current = "signup"
 
-class SignupScreen(Screen):
+class SignupScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", padding=30, spacing=20)
 
         logo = logo_widget((1, 0.5))
         layout.add_widget(logo)
-        layout.add_widget(Label(text="Register Account", font_size=20, color=(1, 1, 1, 1)))
+        layout.add_widget(Label(text="Register Account", font_size=20, color=TEXT_WHITE))
 
         self.username = TextInput(
             hint_text="Username (min 3 chars)",
@@ -420,7 +563,7 @@ class SignupScreen(Screen):
             size_hint=(1, 0.15),
             font_size=24,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
 
         self.password = TextInput(
@@ -430,7 +573,7 @@ class SignupScreen(Screen):
             size_hint=(1, 0.15),
             font_size=24,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
 
         self.phone = TextInput(
@@ -439,7 +582,7 @@ class SignupScreen(Screen):
             size_hint=(1, 0.15),
             font_size=24,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
 
         layout.add_widget(self.username)
@@ -455,8 +598,8 @@ class SignupScreen(Screen):
         signup_btn = Button(
             text="Sign Up",
             size_hint=(1, 0.15),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         signup_btn.bind(on_press=self.register_user)
         layout.add_widget(signup_btn)
@@ -464,7 +607,7 @@ class SignupScreen(Screen):
         login_btn = Button(
             text="Already have an account? Log in",
             background_color=(0, 0, 0, 0),
-            color=(0, 0, 0, 1),
+            color=TEXT_BLACK,
             font_size=18,
         )
         login_btn.bind(on_press=self.go_to_login)
@@ -472,9 +615,6 @@ class SignupScreen(Screen):
 
         self.add_widget(layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def register_user(self, *_):
         """Enhanced user registration with validation"""
         username = self.username.text.strip()
@@ -495,7 +635,7 @@ class SignupScreen(Screen):
                 error_result = {"success": False, "message": f"Registration failed: {str(e)}"}
                 Clock.schedule_once(lambda *_: self._handle_register_result(error_result))
 
-        threading.Thread(target=register_process, daemon=True).start()
+        _BG_POOL.submit(register_process)
 
     def _handle_register_result(self, result):
         self.signup_status.text = ""
@@ -511,15 +651,10 @@ class SignupScreen(Screen):
     def go_to_login(self, *_):
         self.manager.current = "login"
 
-class OTPScreen(Screen):
+class OTPScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", padding=30, spacing=20)
         layout.add_widget(logo_widget((1, 0.7)))
 
@@ -527,7 +662,7 @@ class OTPScreen(Screen):
             Label(
                 text="Security Check-up\nOTP Verification (Demo Mode)",
                 font_size=20,
-                color=(1, 1, 1, 1),
+                color=TEXT_WHITE,
                 halign="center",
             )
         )
@@ -539,15 +674,15 @@ class OTPScreen(Screen):
             size_hint=(1, 0.2),
             font_size=32,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
         layout.add_widget(self.otp_input)
 
         confirm_btn = Button(
             text="Confirm OTP",
             size_hint=(1, 0.15),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         confirm_btn.bind(on_press=self.verify_otp)
         layout.add_widget(confirm_btn)
@@ -555,50 +690,48 @@ class OTPScreen(Screen):
         resend_btn = Button(
             text="Skip OTP (Demo)",
             background_color=(0, 0, 0, 0),
-            color=(0, 0, 0, 1)
+            color=TEXT_BLACK
         )
         resend_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "send"))
         layout.add_widget(resend_btn)
 
         self.add_widget(layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def verify_otp(self, *_):
         if len(self.otp_input.text.strip()) >= 4:
             self.manager.current = "send"
         else:
             show_simple_popup("Error", "Please enter at least 4 digits")
 
-class SendScreen(Screen):
+class SendScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", padding=30, spacing=25)
         layout.add_widget(logo_widget())
 
         # Real-time connection status with SMS verification
-        self.status_label = Label(
+        # Static "Channels:" caption + plain value label, so ticks don't run the markup parser
+        status_row = BoxLayout(orientation="horizontal", size_hint=(1, 0.15), spacing=8)
+        status_row.add_widget(
+            Label(text="Channels:", bold=True, font_size=18, size_hint_x=0.3, color=TEXT_WHITE)
+        )
+        self.status_value = Label(
             text="Checking channels and SMS security...",
-            markup=True,
+            bold=True,
             font_size=18,
-            size_hint=(1, 0.15),
-            color=(1, 1, 1, 1),
+            size_hint_x=0.7,
+            color=ACCENT_BG,
         )
-        layout.add_widget(self.status_label)
+        status_row.add_widget(self.status_value)
+        layout.add_widget(status_row)
 
         # User info display
         self.user_info = Label(
             text="Loading user info...",
             font_size=14,
             size_hint=(1, 0.1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         layout.add_widget(self.user_info)
 
@@ -614,8 +747,8 @@ class SendScreen(Screen):
         send_btn = Button(
             text="🚀 Send Secure Transaction",
             size_hint=(1, 0.2),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         send_btn.bind(on_press=self.go_to_disability)
         layout.add_widget(send_btn)
@@ -626,7 +759,7 @@ class SendScreen(Screen):
         graph_btn = Button(
             text="📊 Security Graph",
             background_color=(1, 0.5, 0, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         graph_btn.bind(on_press=self.show_fraud_graph)
         buttons_layout.add_widget(graph_btn)
@@ -634,7 +767,7 @@ class SendScreen(Screen):
         sms_stats_btn = Button(
             text="📱 SMS Stats",
             background_color=(0.8, 0.2, 0.8, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         sms_stats_btn.bind(on_press=self.show_sms_verification_stats)
         buttons_layout.add_widget(sms_stats_btn)
@@ -642,7 +775,7 @@ class SendScreen(Screen):
         sync_btn = Button(
             text="🔄 Sync",
             background_color=(0.5, 0.5, 1, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         sync_btn.bind(on_press=self.sync_transactions)
         buttons_layout.add_widget(sync_btn)
@@ -650,7 +783,7 @@ class SendScreen(Screen):
         analytics_btn = Button(
             text="📈 Analytics",
             background_color=(0.5, 1, 0.5, 1),
-            color=(0, 0, 0, 1),
+            color=TEXT_BLACK,
         )
         analytics_btn.bind(on_press=self.show_analytics)
         buttons_layout.add_widget(analytics_btn)
@@ -659,15 +792,28 @@ class SendScreen(Screen):
 
         self.add_widget(layout)
 
+        # Last texts applied by update_status
+        self._last_status_text = self.status_value.text
+        self._last_user_text = self.user_info.text
+        self._last_security_text = self.security_info.text
+        # True while a check_status job is queued or running
+        self._status_inflight = False
+        # Worker threads leave (channels, colour, user, security) here and fire the trigger;
+        # user/security are None when the check failed
+        self._pending_status = None
+        self._apply_status_trigger = Clock.create_trigger(self._apply_status, 0)
+
         # Update status every 5 seconds
         Clock.schedule_interval(self.update_status, 5)
         self.update_status()
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def update_status(self, *_):
         """Enhanced status updates with SMS verification info"""
+        # A slow/offline backend can take longer than the 5 s tick; don't stack jobs
+        if self._status_inflight:
+            return
+        self._status_inflight = True
+
         def check_status():
             try:
                 # Get connectivity status
@@ -675,14 +821,10 @@ class SendScreen(Screen):
                 user_info = backend.get_user_info()
 
                 # Channel status
-                channels = []
-                if status.get("online", False): channels.append("🌐 Online")
-                if status.get("bluetooth", False): channels.append("🔵 Bluetooth")
-                if status.get("sms", False): channels.append("📱 SMS")
-                if status.get("local", False): channels.append("💾 Local")
-
-                channels_text = " | ".join(channels) if channels else "No channels available"
-                status_text = f"[b]Channels: [color=00E5D4]{channels_text}[/color][/b]"
+                channels_text = (
+                    " | ".join(label for key, label in _CHANNEL_LABELS if status.get(key))
+                    or "No channels available"
+                )
 
                 # User info
                 username = safe_format_value(user_info.get('username', 'guest'))
@@ -693,30 +835,38 @@ class SendScreen(Screen):
                 details = status.get("details", {})
                 modules_status = details.get("modules_status", {}) if isinstance(details, dict) else {}
 
-                security_features = []
-                if modules_status.get("phishing_detector", False):
-                    security_features.append("SVM Phishing")
-                if modules_status.get("fraud_scoring", False):
-                    security_features.append("Fraud ML")
-                if modules_status.get("sms_phishing_verifier", False):
-                    security_features.append("SMS Verification")
-                if modules_status.get("trust_score", False):
-                    security_features.append("Trust Scoring")
+                security_features = " + ".join(
+                    label for key, label in _SECURITY_LABELS if modules_status.get(key)
+                )
 
                 if security_features:
-                    security_text = f"🛡️ ML Security: {' + '.join(security_features)}\n🔍 4-Layer Protection: Phishing → Fraud → Trust → SMS"
+                    security_text = f"🛡️ ML Security: {security_features}\n🔍 4-Layer Protection: Phishing → Fraud → Trust → SMS"
                 else:
                     security_text = "⚠️ ML Security: Limited | Basic protection only"
 
-                Clock.schedule_once(lambda *_: setattr(self.status_label, "text", status_text))
-                Clock.schedule_once(lambda *_: setattr(self.user_info, "text", user_text))
-                Clock.schedule_once(lambda *_: setattr(self.security_info, "text", security_text))
+                self._pending_status = (channels_text, ACCENT_BG, user_text, security_text)
+                self._apply_status_trigger()
 
             except Exception as e:
-                error_status = f"[b]Status: [color=FF6B6B]Error checking connectivity[/color][/b]"
-                Clock.schedule_once(lambda *_: setattr(self.status_label, "text", error_status))
-
-        threading.Thread(target=check_status, daemon=True).start()
+                self._pending_status = ("Error checking connectivity", STATUS_ERROR, None, None)
+                self._apply_status_trigger()
+
+            finally:
+                self._status_inflight = False
+
+        _BG_POOL.submit(check_status)
+
+    def _apply_status(self, *_):
+        """Apply the latest check_status result; unchanged texts are skipped so a
+        steady-state tick doesn't re-render label textures"""
+        channels_text, color, user_text, security_text = self._pending_status
+        if channels_text != self._last_status_text:
+            self.status_value.color = color
+            self.status_value.text = self._last_status_text = channels_text
+        if user_text is not None and user_text != self._last_user_text:
+            self.user_info.text = self._last_user_text = user_text
+        if security_text is not None and security_text != self._last_security_text:
+            self.security_info.text = self._last_security_text = security_text
 
     def show_fraud_graph(self, *_):
         """Generate and show fraud graph"""
@@ -728,7 +878,7 @@ class SendScreen(Screen):
                 error_msg = f"Graph generation error: {str(e)}"
                 Clock.schedule_once(lambda *_: show_simple_popup("Graph Error", error_msg))
 
-        threading.Thread(target=generate_graph, daemon=True).start()
+        _BG_POOL.submit(generate_graph)
 
     def show_sms_verification_stats(self, *_):
         """NEW: Show SMS verification statistics"""
@@ -746,27 +896,15 @@ class SendScreen(Screen):
                     model_status = sms_stats.get('model_status', 'unknown')
                     avg_risk = sms_stats.get('average_risk_score', 0)
 
-                    details = f"""SMS Phishing Verification Statistics:
-
-Model Status: {model_status.upper()}
-Model Type: {sms_stats.get('model_type', 'SVM')}
-
-Verification Summary:
-• Total Verifications: {total}
-• Approved Payments: {approved}
-• Blocked Payments: {blocked}
-• Approval Rate: {approval_rate:.1f}%
-
-Risk Analysis:
-• Average Risk Score: {avg_risk:.3f}/1.0
-• Threshold Used: 0.4 (40%)
-
-SMS Security Features:
-• Pre-payment SMS analysis
-• 4 templates checked per transaction
-• Real-time SVM classification
-• Automatic phishing detection
-• Payment confirmation notifications"""
+                    details = _SMS_STATS_TEMPLATE.format(
+                        model_status=model_status.upper(),
+                        model_type=sms_stats.get('model_type', 'SVM'),
+                        total=total,
+                        approved=approved,
+                        blocked=blocked,
+                        approval_rate=approval_rate,
+                        avg_risk=avg_risk,
+                    )
 
                 Clock.schedule_once(
                     lambda *_: show_detailed_popup("SMS Verification Stats", "Security Performance", details)
@@ -775,7 +913,7 @@ SMS Security Features:
                 error_msg = f"SMS stats error: {str(e)}"
                 Clock.schedule_once(lambda *_: show_simple_popup("SMS Stats Error", error_msg))
 
-        threading.Thread(target=get_sms_stats, daemon=True).start()
+        _BG_POOL.submit(get_sms_stats)
 
     def sync_transactions(self, *_):
         """Sync transactions with server"""
@@ -788,7 +926,7 @@ SMS Security Features:
                 error_msg = f"Sync error: {str(e)}"
                 Clock.schedule_once(lambda *_: show_simple_popup("Sync Error", error_msg))
 
-        threading.Thread(target=sync_process, daemon=True).start()
+        _BG_POOL.submit(sync_process)
 
     def show_analytics(self, *_):
         """Show enhanced security analytics with SMS verification"""
@@ -833,21 +971,16 @@ Timestamp: {timestamp}"""
                 error_msg = f"Analytics error: {str(e)}"
                 Clock.schedule_once(lambda *_: show_simple_popup("Analytics Error", error_msg))
 
-        threading.Thread(target=get_analytics, daemon=True).start()
+        _BG_POOL.submit(get_analytics)
 
     def go_to_disability(self, *_):
         self.manager.transition = SlideTransition(direction="left")
         self.manager.current = "disability"
 
-class DisabilityScreen(Screen):
+class DisabilityScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", spacing=30, padding=40)
         layout.add_widget(logo_widget((1, 0.5)))
 
@@ -856,7 +989,7 @@ class DisabilityScreen(Screen):
                 text="Choose Transaction Method\nWith SMS Security Verification",
                 font_size=18,
                 size_hint=(1, 0.2),
-                color=(1, 1, 1, 1),
+                color=TEXT_WHITE,
                 halign="center"
             )
         )
@@ -864,8 +997,8 @@ class DisabilityScreen(Screen):
         voice_btn = Button(
             text="🎤 Voice Transaction\n(Accessible + SMS Verification)",
             size_hint=(1, 0.25),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
             font_size=16,
         )
         voice_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "voice"))
@@ -874,8 +1007,8 @@ class DisabilityScreen(Screen):
         manual_btn = Button(
             text="✋ Manual Transaction\n(Standard + SMS Verification)",
             size_hint=(1, 0.25),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
             font_size=16,
         )
         manual_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "manual"))
@@ -883,21 +1016,13 @@ class DisabilityScreen(Screen):
 
         self.add_widget(layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
-class VoiceScreen(Screen):
+class VoiceScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.selected_language = "English"
         self.response_language = "English"
         self.current_recipient = ""
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         self.box = BoxLayout(orientation="vertical", spacing=10, padding=[25, 15, 25, 15])
         self.add_widget(self.box)
 
@@ -906,22 +1031,22 @@ class VoiceScreen(Screen):
         # Language selectors
         self.spinner_input = Spinner(
             text="Select Input Language",
-            values=list(LANGUAGE_CODES.keys()),
+            values=list(LANGUAGE_CODES),
             size_hint_y=None,
             height=48,
             background_color=(1, 1, 1, 0.2),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         self.spinner_input.bind(text=lambda _, val: setattr(self, "selected_language", val))
         self.box.add_widget(self.spinner_input)
 
         self.spinner_response = Spinner(
             text="Select Response Language",
-            values=list(TTS_CODES.keys()),
+            values=list(LANGUAGE_CODES),
             size_hint_y=None,
             height=48,
             background_color=(1, 1, 1, 0.2),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         self.spinner_response.bind(text=lambda _, val: setattr(self, "response_language", val))
         self.box.add_widget(self.spinner_response)
@@ -933,7 +1058,7 @@ class VoiceScreen(Screen):
             size_hint_y=None,
             height=48,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
         self.box.add_widget(self.recipient_input)
 
@@ -942,7 +1067,7 @@ class VoiceScreen(Screen):
             text="Ready for voice input with SMS verification", font_size=16, color=(1, 1, 0, 1), size_hint_y=None, height=30
         )
         self.result = Label(
-            text="", font_size=14, color=(1, 1, 1, 1), size_hint_y=None, height=60
+            text="", font_size=14, color=TEXT_WHITE, size_hint_y=None, height=60
         )
         self.security_status = Label(
             text="", font_size=12, color=(1, 0.5, 0, 1), size_hint_y=None, height=50
@@ -957,8 +1082,8 @@ class VoiceScreen(Screen):
             text="🎤 Record Amount (SMS Verified)",
             size_hint_y=None,
             height=50,
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
             font_size=16,
         )
         self.record_button.bind(on_press=self.record_and_recognize)
@@ -970,7 +1095,7 @@ class VoiceScreen(Screen):
         next_button = Button(
             text="Next",
             background_color=(1, 0.5, 0, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         next_button.bind(on_press=lambda *_: setattr(self.manager, "current", "continue"))
         nav_layout.add_widget(next_button)
@@ -978,16 +1103,13 @@ class VoiceScreen(Screen):
         back_button = Button(
             text="Back",
             background_color=(0.5, 0.5, 0.5, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         back_button.bind(on_press=lambda *_: setattr(self.manager, "current", "disability"))
         nav_layout.add_widget(back_button)
 
         self.box.add_widget(nav_layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def record_and_recognize(self, *_):
         recipient = self.recipient_input.text.strip()
         if not recipient:
@@ -1001,6 +1123,10 @@ class VoiceScreen(Screen):
 
     def _record_process(self):
         try:
+            import sounddevice as sd
+            import speech_recognition as sr
+            import wavio
+
             fs, duration = 16_000, 5
             play_beep()
             audio = sd.rec(int(duration * fs), samplerate=fs, channels=1)
@@ -1071,7 +1197,7 @@ class VoiceScreen(Screen):
                 }
                 Clock.schedule_once(lambda *_: self._handle_transaction_result(error_result))
 
-        threading.Thread(target=process_voice, daemon=True).start()
+        _BG_POOL.submit(process_voice)
 
     def _handle_transaction_result(self, result):
         """ENHANCED: Handle transaction result with SMS verification and payment confirmation SMS info"""
@@ -1244,12 +1370,14 @@ class VoiceScreen(Screen):
 
     def _speak_pyttsx3(self, text: str):
         """Method 1: Offline TTS using pyttsx3"""
+        import pyttsx3
+
         engine = pyttsx3.init()
         engine.setProperty('rate', 150)
         engine.setProperty('volume', 0.8)
 
         voices = engine.getProperty('voices')
-        lang_code = TTS_CODES.get(self.response_language, 'en')
+        lang_code = LANGUAGE_CODES.get(self.response_language, 'en')
 
         for voice in voices:
             if lang_code in voice.id.lower():
@@ -1263,7 +1391,9 @@ class VoiceScreen(Screen):
 
     def _speak_gtts(self, text: str):
         """Method 2: Online TTS using gTTS + playsound"""
-        tts = gTTS(text=text, lang=TTS_CODES[self.response_language], slow=False)
+        from gtts import gTTS
+
+        tts = gTTS(text=text, lang=LANGUAGE_CODES[self.response_language], slow=False)
         tfile = Path(f"tts_{uuid.uuid4().hex}.mp3")
 
         tts.save(str(tfile))
@@ -1288,18 +1418,13 @@ class VoiceScreen(Screen):
         self.status.text = "Ready for voice input with SMS verification"
         self.record_button.disabled = False
 
-class ManualScreen(Screen):
+class ManualScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", spacing=20, padding=40)
         layout.add_widget(logo_widget((1, 0.3)))
-        layout.add_widget(Label(text="Manual Payment with 4-Layer ML Security", font_size=20, color=(1, 1, 1, 1)))
+        layout.add_widget(Label(text="Manual Payment with 4-Layer ML Security", font_size=20, color=TEXT_WHITE))
 
         # Recipient input
         self.recipient_input = TextInput(
@@ -1308,7 +1433,7 @@ class ManualScreen(Screen):
             size_hint=(1, 0.12),
             font_size=24,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
         layout.add_widget(self.recipient_input)
 
@@ -1320,7 +1445,7 @@ class ManualScreen(Screen):
             size_hint=(1, 0.12),
             font_size=28,
             background_color=(1, 1, 1, 0.4),
-            foreground_color=(0, 0, 0, 1),
+            foreground_color=TEXT_BLACK,
         )
         layout.add_widget(self.amount_input)
 
@@ -1334,8 +1459,8 @@ class ManualScreen(Screen):
         submit_btn = Button(
             text="🔒 Process with SMS Verification",
             size_hint=(1, 0.15),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         submit_btn.bind(on_press=self.process_secure_transaction)
         layout.add_widget(submit_btn)
@@ -1345,7 +1470,7 @@ class ManualScreen(Screen):
             text="📱 Preview SMS Templates",
             size_hint=(1, 0.1),
             background_color=(0.7, 0.7, 0.7, 1),
-            color=(0, 0, 0, 1),
+            color=TEXT_BLACK,
         )
         preview_btn.bind(on_press=self.preview_sms_templates)
         layout.add_widget(preview_btn)
@@ -1356,7 +1481,7 @@ class ManualScreen(Screen):
         next_btn = Button(
             text="Next",
             background_color=(1, 0.5, 0, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         next_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "continue"))
         nav_layout.add_widget(next_btn)
@@ -1364,7 +1489,7 @@ class ManualScreen(Screen):
         back_btn = Button(
             text="Back",
             background_color=(0.5, 0.5, 0.5, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         back_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "disability"))
         nav_layout.add_widget(back_btn)
@@ -1373,9 +1498,6 @@ class ManualScreen(Screen):
 
         self.add_widget(layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def preview_sms_templates(self, *_):
         """NEW: Preview SMS templates that will be verified"""
         recipient = self.recipient_input.text.strip()
@@ -1450,7 +1572,7 @@ class ManualScreen(Screen):
                 }
                 Clock.schedule_once(lambda *_: self._handle_transaction_result(error_result))
 
-        threading.Thread(target=process_transaction, daemon=True).start()
+        _BG_POOL.submit(process_transaction)
 
     def _handle_transaction_result(self, result):
         """ENHANCED: Handle transaction result with complete SMS verification display and payment confirmation SMS info"""
@@ -1622,15 +1744,10 @@ Processing Time: {int(processing_time)}ms
         except Exception as e:
             return "• Channel: Processing\n• Status: Completed"
 
-class ContinueScreen(Screen):
+class ContinueScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", spacing=30, padding=40)
         layout.add_widget(logo_widget((1, 0.5)))
 
@@ -1638,7 +1755,7 @@ class ContinueScreen(Screen):
             Label(
                 text="Secure Transaction Complete!\n4-Layer ML Security + SMS Verification\nMake another transaction?",
                 font_size=18,
-                color=(1, 1, 1, 1),
+                color=TEXT_WHITE,
                 halign="center",
             )
         )
@@ -1646,8 +1763,8 @@ class ContinueScreen(Screen):
         yes_btn = Button(
             text="Yes - New Secure Transaction",
             size_hint=(1, 0.2),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         yes_btn.bind(on_press=self.go_to_disability)
         layout.add_widget(yes_btn)
@@ -1656,7 +1773,7 @@ class ContinueScreen(Screen):
             text="Security Dashboard",
             size_hint=(1, 0.2),
             background_color=(1, 0.5, 0, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         dashboard_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "send"))
         layout.add_widget(dashboard_btn)
@@ -1665,28 +1782,20 @@ class ContinueScreen(Screen):
             text="Exit App",
             size_hint=(1, 0.2),
             background_color=(1, 0.3, 0.3, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         exit_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "exit"))
         layout.add_widget(exit_btn)
 
         self.add_widget(layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
     def go_to_disability(self, *_):
         self.manager.current = "disability"
 
-class ExitScreen(Screen):
+class ExitScreen(_ThemedScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        with self.canvas.before:
-            Color(*Window.clearcolor)
-            self.rect = Rectangle(size=self.size, pos=self.pos)
-            self.bind(size=self._update_rect, pos=self._update_rect)
-
         layout = BoxLayout(orientation="vertical", padding=50, spacing=20)
         layout.add_widget(logo_widget((1, 0.6)))
 
@@ -1694,7 +1803,7 @@ class ExitScreen(Screen):
             Label(
                 text="Thank you for using PayMesh!\nSecure Offline Payments with 4-Layer ML Security\nIncluding SMS Phishing Verification & Payment Confirmations",
                 font_size=20,
-                color=(1, 1, 1, 1),
+                color=TEXT_WHITE,
                 halign="center"
             )
         )
@@ -1702,8 +1811,8 @@ class ExitScreen(Screen):
         exit_btn = Button(
             text="Exit App",
             size_hint=(0.5, 0.2),
-            background_color=(0 / 255, 229 / 255, 212 / 255, 1),
-            color=(0, 0, 0, 1),
+            background_color=ACCENT_BG,
+            color=TEXT_BLACK,
         )
         exit_btn.bind(on_press=lambda *_: App.get_running_app().stop())
         layout.add_widget(exit_btn)
@@ -1712,22 +1821,20 @@ class ExitScreen(Screen):
             text="Restart App",
             size_hint=(0.5, 0.2),
             background_color=(1, 0.5, 0, 1),
-            color=(1, 1, 1, 1),
+            color=TEXT_WHITE,
         )
         restart_btn.bind(on_press=lambda *_: setattr(self.manager, "current", "start"))
         layout.add_widget(restart_btn)
 
         self.add_widget(layout)
 
-    def _update_rect(self, *_):
-        self.rect.pos, self.rect.size = self.pos, self.size
-
 # --------------------------------------------------------------------------- #
 # APPLICATION ROOT
 # --------------------------------------------------------------------------- #
 
 class PayMeshApp(App):
     def build(self):
+        _BG_POOL.submit(_load_beep)  # decode the beep before the first recording needs it
         sm = ScreenManager()
 
         # Add all screens
@@ -1754,4 +1861,7 @@ class PayMeshApp(App):
             pass
 
 if __name__ == "__main__":
+    # Backend security-layer verdicts are logged under "paymesh"; show them on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("paymesh").setLevel(logging.INFO)
     PayMeshApp().run()
@@ -51,6 +51,32 @@ def classify_sms(text):
             "error": str(e)
         }
 
+def classify_sms_batch(texts):
+    """Vectorized classify_sms: one decision_function/predict call for all texts.
+
+    Returns a list of result dicts in the same order as texts.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if not MODEL_AVAILABLE or model is None:
+        return [classify_sms(text) for text in texts]
+
+    try:
+        scores = model.decision_function(texts)
+        labels = model.predict(texts)
+    except Exception as e:
+        return [{"is_phishing": False, "confidence": 0.0, "error": str(e)} for _ in texts]
+
+    results = []
+    for score, label in zip(scores, labels):
+        confidence = abs(score) / (abs(score) + 1)
+        results.append({
+            "is_phishing": bool(label),
+            "confidence": round(confidence, 2)
+        })
+    return results
+
 # ✅ Example test
 if __name__ == "__main__":
     test_messages = [
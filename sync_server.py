@@ -6,6 +6,9 @@ app = Flask(__name__)
 BASE_DIR = r"D:\The New Data Trio"
 DB_PATH = os.path.join(BASE_DIR, "ledger.db")
 
+# Stay well under SQLite's bound-parameter limit (999 on older builds), as ledger.mark_synced does
+SYNC_BATCH_CHUNK = 500
+
 @app.route("/")
 def home():
     return "🟢 Sync server is running", 200
@@ -28,6 +31,36 @@ def sync_transaction():
     except Exception as e:
         return jsonify({"status": "error", "msg": str(e)}), 500
 
+@app.route("/sync_batch", methods=["POST"])
+def sync_transaction_batch():
+    data = request.get_json() or {}
+    ids = data.get("ids")
+
+    if not ids or not isinstance(ids, list):
+        return jsonify({"status": "error", "msg": "Missing ids"}), 400
+
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        found = set()
+        # One SELECT + UPDATE per chunk, all in a single commit
+        for i in range(0, len(ids), SYNC_BATCH_CHUNK):
+            chunk = ids[i:i + SYNC_BATCH_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT id FROM transactions WHERE id IN ({placeholders})", chunk)
+            found.update(row[0] for row in cursor.fetchall())
+            cursor.execute(f"UPDATE transactions SET synced=1 WHERE id IN ({placeholders})", chunk)
+        results = [
+            {"id": txn_id, "status": "success"} if txn_id in found
+            else {"id": txn_id, "status": "error", "msg": "Txn not found"}
+            for txn_id in ids
+        ]
+        conn.commit()
+        conn.close()
+        return jsonify({"status": "success", "results": results}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "msg": str(e)}), 500
+
 @app.route("/upload", methods=["POST"])
 def upload_transaction():
     data = request.get_json()